@@ -5,6 +5,7 @@ Created on Mon Jul 11 09:41:18 2022
 @author: micha
 """
 
+from math import cos, sin
 import os
 import sys
 
@@ -26,7 +27,8 @@ fTheta = 10.0
 matProj = np.array([[fAspectRatio*fFovRad, 0      , 0                               , 0],
                     [0                   , fFovRad, 0                               , 0],
                     [0                   , 0      , fFar / (fFar - fNear)           , 1],
-                    [0                   , 0      , (-fFar * fNear) / (fFar - fNear), 0]])
+                    [0                   , 0      , (-fFar * fNear) / (fFar - fNear), 0]],
+                   dtype=np.float32)
 
 canvas = display.Canvas(Width, Height)
 
@@ -38,7 +40,7 @@ class vec3d:
         self.y = y
         self.z = z
 
-        self.xyz = np.array([[x, y, z]])
+        self.xyz = np.array([[x, y, z]], dtype=np.float32)
 
     def __repr__(self):
         return f'Point(x={self.x}, y={self.y}, z={self.z})'
@@ -60,7 +62,7 @@ class mesh:
     """ DOCSTRING """
     def __init__(self, *args):
 
-        self.tris = np.array([arg.p for arg in args])
+        self.tris = np.array([arg.p for arg in args], dtype=np.float32)
 
     def __repr__(self):
         return repr(self.tris.reshape((1,-1,9)))
@@ -70,36 +72,36 @@ def w_pad(point):
     if len(point.shape) == 2: # Single point
         point = point.reshape((1, 3, 1))
     c, r, _ = point.shape
-    return np.append(point, np.ones((c, r, 1)), axis=-1)
+    return np.append(point, np.ones((c, r, 1), dtype=point.dtype), axis=-1)
 
 def w_matmul(i, j, pad=True):
     """ DOCSTRING """
     if pad:
         i = w_pad(i)
     o = i @ j
-    i, w = o[:,:,:3], o[:,:,-1].reshape((-1, 3, 1))
-    w = np.where(w==0, 1, w)
-    return i / w
+    i, w = o[:,:,:3], o[:,:,3:]
+    np.divide(i, w, out=i, where=w!=0)
+    return i
 
 def DrawTriangle(x1, y1, x2, y2, x3, y3, canvas):
     canvas.add(objects.Line((x1, y1), (x2, y2), div=2))
     canvas.add(objects.Line((x2, y2), (x3, y3), div=2))
     canvas.add(objects.Line((x3, y3), (x1, y1), div=2))
 
-matRotZ = np.zeros((4,4))
-matRotZ[0,0] = np.cos(fTheta)
-matRotZ[0,1] = np.sin(fTheta)
-matRotZ[1,0] = -np.sin(fTheta)
-matRotZ[1,1] = np.cos(fTheta)
+matRotZ = np.zeros((4,4), dtype=np.float32)
+matRotZ[0,0] = cos(fTheta)
+matRotZ[0,1] = sin(fTheta)
+matRotZ[1,0] = -sin(fTheta)
+matRotZ[1,1] = cos(fTheta)
 matRotZ[2,2] = 1.0
 matRotZ[3,3] = 1.0
 
-matRotX = np.zeros((4,4))
+matRotX = np.zeros((4,4), dtype=np.float32)
 matRotX[0,0] = 1.0
-matRotX[1,1] = np.cos(fTheta * 0.5)
-matRotX[1,2] = np.sin(fTheta * 0.5)
-matRotX[2,1] = -np.sin(fTheta * 0.5)
-matRotX[2,2] = np.cos(fTheta * 0.5)
+matRotX[1,1] = cos(fTheta * 0.5)
+matRotX[1,2] = sin(fTheta * 0.5)
+matRotX[2,1] = -sin(fTheta * 0.5)
+matRotX[2,2] = cos(fTheta * 0.5)
 matRotX[3,3] = 1.0
 
 meshCube = mesh(
@@ -130,10 +132,10 @@ meshCube = mesh(
 
 meshCube.tris = w_matmul(meshCube.tris, matRotZ)
 meshCube.tris = w_matmul(meshCube.tris, matRotX)
-meshCube.tris = meshCube.tris + np.repeat(np.array([[0.0, 0.0, 3.0]]), 3, axis=0) # Just need for Z
+meshCube.tris += (0.0, 0.0, 3.0) # Just need for Z
 meshCube.tris = w_matmul(meshCube.tris, matProj)
-meshCube.tris = meshCube.tris + np.repeat(np.array([[1.0, 1.0, 0.0]]), 3, axis=0) # Just need for X and Y
-meshCube.tris = meshCube.tris * np.repeat(np.array([[0.5 * Width, 0.5 * Height, 1.0]]), 3, axis=0)
+meshCube.tris += (1.0, 1.0, 0.0) # Just need for X and Y
+meshCube.tris *= (0.5 * Width, 0.5 * Height, 1.0)
 for tri in meshCube.tris:
     DrawTriangle(*tri[:, :-1].reshape(-1), canvas)
 canvas.show()
\ No newline at end of file
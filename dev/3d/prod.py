@@ -5,6 +5,9 @@ Created on Mon Jul 11 09:41:18 2022
 @author: micha
 """
 
+from collections import namedtuple
+from functools import lru_cache
+from math import cos, sin
 import os
 import sys
 
@@ -12,6 +15,11 @@ from colour import Color
 import numpy as np
 import pywavefront
 
+try:
+    from numba import njit, prange
+except ImportError: # Falls back to the NumPy transform below
+    njit = None
+
 minimal_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 sys.path.insert(0, minimal_dir)
 from minimal import objects, display
@@ -30,35 +38,61 @@ fTheta = 10.0
 matProj = np.array([[fAspectRatio*fFovRad, 0      , 0                               , 0],
                     [0                   , fFovRad, 0                               , 0],
                     [0                   , 0      , fFar / (fFar - fNear)           , 1],
-                    [0                   , 0      , (-fFar * fNear) / (fFar - fNear), 0]])
+                    [0                   , 0      , (-fFar * fNear) / (fFar - fNear), 0]],
+                   dtype=np.float32)
 
 CANVAS = display.Canvas(Width, Height)
 CANVAS.mat_project = matProj # TODO: Add this to canvas class
 
+# Row/column pair holding the cos/sin terms for a rotation about each axis
+_ROTATION_AXES = {'x': (1, 2), 'y': (0, 2), 'z': (0, 1)}
+_ROTATION_TEMPLATES = {axis: np.eye(4, dtype=np.float32) for axis in _ROTATION_AXES}
+
 class geometry:
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def get_rotation_matrix(axis, theta=0.0):
         """DOCSTRING"""
-        if axis == 'x':
-            rot_mat = np.array([[1.0, 0.0,            0.0,            0.0],
-                                [0.0, np.cos(theta),  np.sin(theta),  0.0],
-                                [0.0, -np.sin(theta), np.cos(theta),  0.0],
-                                [0.0, 0.0,            0.0,            1.0]])
-        elif axis == 'y':
-            rot_mat = np.array([[np.cos(theta),  0.0, np.sin(theta), 1.0],
-                                [0.0,            1.0, 0.0,           0.0],
-                                [-np.sin(theta), 0.0, np.cos(theta), 0.0],
-                                [0.0,            0.0, 0.0,           1.0]])
-
-        elif axis == 'z':
-            rot_mat = np.array([[np.cos(theta),  np.sin(theta), 0.0, 0.0],
-                                [-np.sin(theta), np.cos(theta), 0.0, 0.0],
-                                [0.0,             0.0,          1.0, 0.0],
-                                [0.0,             0.0,          0.0, 1.0]])
+        # Only the four sin/cos slots of the axis template are rewritten, the
+        # result is cached read-only since frames repeat the same angles
+        a, b = _ROTATION_AXES[axis]
+        c, s = cos(theta), sin(theta)
+
+        rot_mat = _ROTATION_TEMPLATES[axis]
+        rot_mat[a, a], rot_mat[a, b] = c, s
+        rot_mat[b, a], rot_mat[b, b] = -s, c
+
+        rot_mat = rot_mat.copy()
+        rot_mat.flags.writeable = False
 
         return rot_mat
 
+    @staticmethod
+    def get_translation_matrix(x=0.0, y=0.0, z=0.0):
+        """DOCSTRING"""
+        trans_mat = np.eye(4, dtype=np.float32)
+        trans_mat[3, :3] = x, y, z
+
+        return trans_mat
+
+    @staticmethod
+    def get_scale_matrix(x=1.0, y=1.0, z=1.0):
+        """DOCSTRING"""
+
+        return np.diag(np.array((x, y, z, 1.0), dtype=np.float32))
+
+    @staticmethod
+    def get_screen_matrix(width, height):
+        """DOCSTRING"""
+        # Maps [-1, 1] -> [0, width/height]. Written against the homogeneous
+        # coordinate (x + w instead of x + 1) so it can be folded in ahead of
+        # the perspective divide
+        screen_mat = np.diag(np.array((0.5*width, 0.5*height, 1.0, 1.0), dtype=np.float32))
+        screen_mat[3, :2] = 0.5*width, 0.5*height
+
+        return screen_mat
+
     def normal(arr, normalize=True):
         """ DOCSTRING """
 
@@ -69,63 +103,75 @@ class geometry:
         return norm_vec
 
 
-class vec3d:
+# Points are thin tuples; all vertex storage lives in the Mesh buffer
+vec3d = namedtuple("vec3d", ["x", "y", "z"], defaults=(0.0,))
+
+# Three (4,) row views into a (3, 4) triangle; nothing is copied
+TriangleView = namedtuple("TriangleView", ["p1", "p2", "p3"])
+
+def triangle_lengths(tri):
     """ DOCSTRING """
-    def __init__(self, x, y, z=0):
+    # Same thing as np.linalg.norm(arr - np.roll(arr, -1, axis=0), axis=1)
+    # but is about 3x more efficient
 
-        self.x = x
-        self.y = y
-        self.z = z
+    p1, p2, p3 = tri
+    len12 = np.sqrt((p1[0]-p2[0])**2 + (p1[1]-p2[1])**2)
+    len23 = np.sqrt((p2[0]-p3[0])**2 + (p2[1]-p3[1])**2)
+    len31 = np.sqrt((p3[0]-p1[0])**2 + (p3[1]-p1[1])**2)
 
-        self.xyz = np.array([[x, y, z]])
+    return len12, len23, len31
 
-    def __repr__(self):
-        return f'Point(x={self.x}, y={self.y}, z={self.z})'
+def fill_triangle(tri, color):
+    """ DOCSTRING """
+    # https://stackoverflow.com/questions/63674527/filling-in-a-triangle-by-drawing-lines-in-pygame @ Rabbid76
+    len12, len23, len31 = triangle_lengths(tri)
+    q1, q2, q3 = tri
+    lens = {len12: (q1, q3, q2),
+            len23: (q2, q1, q3),
+            len31: (q3, q2, q1)}
+    p1, p2, p3 = lens[max(lens)]
+    x1, y1, x2, y2, x3, y3 = (float(v) for v in (p1[0], p1[1], p2[0], p2[1], p3[0], p3[1]))
+
+    # Scanline endpoints along the longest edge are computed in one pass
+    if abs(x3-x1) > abs(y3-y1):
+        xs = np.arange(int(min(x1, x3)), int(max(x1, x3)+1), dtype=np.float32)
+        ys = ((y1 - y3)/ (x1 - x3))*(xs - x3) + y3
+    else:
+        ys = np.arange(int(min(y1, y3)), int(max(y1, y3)+1), dtype=np.float32)
+        xs = ((x1 - x3)/ (y1 - y3))*(ys - y3) + x3
+
+    return [objects.Line((x, y), (x2, y2), div=100, color=color)
+            for x, y in zip(xs.tolist(), ys.tolist())]
 
 class Triangle:
     """ DOCSTRING """
-    def __init__(self, p1, p2, p3, color=Color(luminance=0)):
+    def __init__(self, p, color=Color(luminance=0)):
 
-        self.p1 = p1 if isinstance(p1, vec3d) else vec3d(*p1)
-        self.p2 = p2 if isinstance(p2, vec3d) else vec3d(*p2)
-        self.p3 = p3 if isinstance(p3, vec3d) else vec3d(*p3)
-
-        self.p = np.array([*self.p1.xyz, *self.p2.xyz, *self.p3.xyz])
+        # p is a (3, 4) homogeneous view into Mesh.vertices, not a copy
+        self.p = p
         self.color = color
 
+    @property
+    def p1(self):
+        return vec3d(*self.p[0, :3])
+
+    @property
+    def p2(self):
+        return vec3d(*self.p[1, :3])
+
+    @property
+    def p3(self):
+        return vec3d(*self.p[2, :3])
+
     def get_lengths(self):
         """ DOCSTRING """
-        # Same thing as np.linalg.norm(arr - np.roll(arr, -1, axis=0), axis=1)
-        # but is about 3x more efficient
 
-        len12 = np.sqrt((self.p1.x-self.p2.x)**2 + (self.p1.y-self.p2.y)**2)
-        len23 = np.sqrt((self.p2.x-self.p3.x)**2 + (self.p2.y-self.p3.y)**2)
-        len31 = np.sqrt((self.p3.x-self.p1.x)**2 + (self.p3.y-self.p1.y)**2)
-
-        return len12, len23, len31
+        return triangle_lengths(TriangleView(*self.p))
 
     def fill(self, color):
         """ DOCSTRING """
-        # https://stackoverflow.com/questions/63674527/filling-in-a-triangle-by-drawing-lines-in-pygame @ Rabbid76
-        len12, len23, len31 = self.get_lengths()
-        lens = {len12: (self.p1, self.p3, self.p2),
-                len23: (self.p2, self.p1, self.p3),
-                len31: (self.p3, self.p2, self.p1)}
-        p1, p2, p3 = lens[max(lens)]
-
-        fill_lines = []
-        if abs(p3.x-p1.x) > abs(p3.y-p1.y):
-            for x in range(int(min(p1.x, p3.x)), int(max(p1.x, p3.x)+1)):
-                m = ((p1.y - p3.y)/ (p1.x - p3.x))
-                y = m*(x - p3.x) + p3.y
-                fill_lines.append(objects.Line((x, y), (p2.x, p2.y), div=100, color=color))
-        else:
-            for y in range(int(min(p1.y, p3.y)), int(max(p1.y, p3.y)+1)):
-                m = ((p1.x - p3.x)/ (p1.y - p3.y))
-                x = m*(y - p3.y) + p3.x
-                fill_lines.append(objects.Line((x, y), (p2.x, p2.y), div=100, color=color))
 
-        return fill_lines
+        return fill_triangle(TriangleView(*self.p), color)
 
     def __repr__(self):
         return repr(self.p)
@@ -134,64 +180,115 @@ class Mesh:
     """ DOCSTRING """
     def __init__(self, *args, wireframe=True):
 
-        if not len(args):
-            self.vertices = np.array([])
-        else:
-            self.vertices = np.array([arg.p for arg in args])
+        # args are triangles given as three (x, y, z) points each. Shared
+        # corners are stored once in vertices (V, 4) and referenced by
+        # indices (T, 3) so transforms only touch unique points
+        points = np.asarray(args, dtype=np.float32).reshape((-1, 3))
+        points, indices = np.unique(points, axis=0, return_inverse=True)
+        self.vertices = self._homogeneous(points)
+        self.indices = indices.reshape((-1, 3)).astype(np.int32)
+
+        self._scratch = np.empty_like(self.vertices)
 
-        self._tris = self.vertices.copy()
+        # Pending model transformation, applied in one pass at draw time
+        self.transformation = np.eye(4, dtype=np.float32)
 
         self.normals = None
         self.visible_mask = None
         self.fill_color = None
+        self.camera = vec3d(x=0, y=0, z=0)
+        self.cull = False
         self.textures = {}
 
         self.wireframe = wireframe
 
         self.order = display.Order()
+        self.lines = objects.LineBuffer()
+
+    @staticmethod
+    def _homogeneous(points):
+        """ DOCSTRING """
+
+        points = np.asarray(points, dtype=np.float32).reshape((-1, 3))
+        vertices = np.empty((len(points), 4), dtype=np.float32)
+        vertices[:, :3] = points
+        vertices[:, 3] = 1.0
+        return vertices
 
-    def from_obj(self, fp):
+    @property
+    def tris(self):
         """ DOCSTRING """
+        # Gathered (T, 3, 4) copy for triangle-level access
+        return self.vertices[self.indices]
 
-        tris = []
+    def from_obj(self, fp, optimize=True):
+        """ DOCSTRING """
 
         obj = pywavefront.Wavefront(fp, collect_faces=True, create_materials=False)
-        for face in obj.mesh_list[0].faces:
-            tris.append(Triangle(obj.vertices[face[0]], obj.vertices[face[1]], obj.vertices[face[2]]))
-        self.vertices = np.array([tri.p for tri in tris])
+        faces = np.asarray(obj.mesh_list[0].faces, dtype=np.int32)
+        if optimize:
+            faces = optimize_vertex_cache(faces, len(obj.vertices))
+        self.vertices = self._homogeneous(obj.vertices)
+        self.indices = faces
+
+    def snapshot(self):
+        """ DOCSTRING """
+        # Drawing transforms vertices in place and culls indices, so a mesh
+        # reused across frames is restored from this state before each one
+        return (self.vertices.copy(), self.indices, self.transformation.copy())
+
+    def restore(self, snap):
+        """ DOCSTRING """
+
+        vertices, self.indices, transformation = snap
+        if self.vertices.shape == vertices.shape:
+            np.copyto(self.vertices, vertices)
+        else:
+            self.vertices = vertices.copy()
+        np.copyto(self.transformation, transformation)
+
+    def _reserve_scratch(self):
+        """ DOCSTRING """
+
+        if self._scratch.shape != self.vertices.shape:
+            self._scratch = np.empty_like(self.vertices)
+
+    def apply(self, mat):
+        """ DOCSTRING """
+        # Vertices and scratch are swapped after each product so that no
+        # transform allocates once the buffers are sized to the mesh
+        self._reserve_scratch()
+        out = w_matmul(self.vertices, mat, out=self._scratch)
+        self._scratch, self.vertices = self.vertices, out
 
     def rotate(self, axis, theta):
         """ DOCSTRING """
 
         rot_mat = geometry.get_rotation_matrix(axis, theta)
-        self.vertices = w_matmul(self.vertices, rot_mat)
+        self.transformation = self.transformation @ rot_mat
 
     def translate(self, x=0.0, y=0.0, z=0.0, method="add"):
         """ DOCSTRING """
 
         if method == "add":
-            self.vertices += np.repeat(np.array([[x, y, z]]), 3, axis=0)
+            mat = geometry.get_translation_matrix(x, y, z)
         elif method == "sub":
-            self.vertices -= np.repeat(np.array([[x, y, z]]), 3, axis=0)
+            mat = geometry.get_translation_matrix(-x, -y, -z)
         elif method == "mul":
-            self.vertices *= np.repeat(np.array([[x, y, z]]), 3, axis=0)
+            mat = geometry.get_scale_matrix(x, y, z)
         elif method == "div":
-            self.vertices /= np.repeat(np.array([[x, y, z]]), 3, axis=0)
+            mat = geometry.get_scale_matrix(*np.reciprocal(np.array((x, y, z), dtype=np.float32)))
         else:
             raise KeyError(f"Method not recognized; provided {method}. "
                            "Accepts: 'add', 'sub', 'mul', 'div'")
 
-    def visible(self, camera=vec3d(x=0, y=0, z=0)):
-        """ DOCSTRING """
-
-        self.textures['visible'] = {"func": self._visible, "params": (camera,)}
+        self.transformation = self.transformation @ mat
 
-    def _visible(self, camera):
+    def visible(self, camera=vec3d(x=0, y=0, z=0)):
         """ DOCSTRING """
 
-        self.normals = geometry.normal(self.vertices)
-        self.visible_mask = np.sum(self.normals * (self.vertices[:,0,:] - camera.xyz), axis=1) < 0.0
-        self.vertices = self.vertices[self.visible_mask]
+        self.camera = camera
+        self.cull = True
 
     def illuminate(self, light_direction=vec3d(0.0, 0.0, -1.0)):
         """ DOCSTRING """
@@ -202,52 +299,73 @@ class Mesh:
     def _illuminate(self, light_direction=vec3d(0.0, 0.0, -1.0)): #TODO: Seems like this is broken
         """ DOCSTRING """
         # TODO: Techincally, illuminate will produce an illumination for all faces and not just ones that are left
-        normals = self.normals[self.visible_mask] if 'visible' in self.textures else self.normal
-        light_direction.xyz = light_direction.xyz / np.sqrt(np.sum(light_direction.xyz**2, axis=1))
-        dp = normals @ light_direction.xyz.T
+        self.normals = geometry.normal(self.tris[:, :, :3])
+        normals = self.normals
+        light = np.asarray(light_direction, dtype=np.float32)
+        light = light / np.sqrt(np.sum(light**2))
+        dp = normals @ light
         # dp = np.where(dp < 0.0, 0.0, dp)
         print(dp)
         self.fill_color = [Color(luminance=0.6) for i in dp] # TODO: Work on better illumination color code
 
-    def project(self, canvas):
+    def _apply_modelview(self):
+        """ DOCSTRING """
+        # Model transforms are composed into a single 4x4 and applied in one
+        # pass, which also tests visibility in view space
+        self._reserve_scratch()
+        self.visible_mask = np.empty(len(self.indices), dtype=np.bool_)
+
+        transform_mesh(self.vertices, self.indices, self.transformation,
+                       np.asarray(self.camera, dtype=np.float32),
+                       self._scratch, self.visible_mask)
+        self._scratch, self.vertices = self.vertices, self._scratch
+        self.transformation = np.eye(4, dtype=np.float32)
+
+    def _cull(self):
         """ DOCSTRING """
 
-        self.vertices = w_matmul(self.vertices, canvas.mat_project)
+        if self.cull:
+            self.indices = self.indices[self.visible_mask]
 
-    def sort(self):
+    def project(self, canvas):
         """ DOCSTRING """
+        # Projection and screen transforms are composed so only the triangles
+        # surviving culling are traversed, once
+        mat = canvas.mat_project @ geometry.get_screen_matrix(canvas.width, canvas.height)
+        self.apply(mat)
 
-        self.vertices = self.vertices[(np.sum(self.vertices[:,:,-1], axis=1) / 3).argsort()]
-
-    def _wireframe(self):
+    def sort(self):
         """ DOCSTRING """
 
-        for tri in self.vertices:
-            self.order.append(objects.Line((tri[0,0], tri[0,1]), (tri[1,0], tri[1,1]), div=100))
-            self.order.append(objects.Line((tri[1,0], tri[1,1]), (tri[2,0], tri[2,1]), div=100))
-            self.order.append(objects.Line((tri[2,0], tri[2,1]), (tri[0,0], tri[0,1]), div=100))
+        # Summed depth orders the same as the mean; only the (T, 3) index
+        # rows are permuted, the vertex buffer stays in place
+        order = np.argsort(self.vertices[:, 2][self.indices].sum(axis=1), kind='stable')
+        self.indices = self.indices[order]
 
-    def triangles(self):
+    def _wireframe(self):
         """ DOCSTRING """
 
-        return [Triangle(vertex[0,:], vertex[1,:], vertex[2,:]) for vertex in self.vertices]
+        # Edges 0-1, 1-2, 2-0 of every triangle as (T*3, 2, 2) endpoints
+        tris = self.tris[:, :, :2]
+        self.lines.extend(np.stack((tris, np.roll(tris, -1, axis=1)), axis=2))
 
     def _shaded(self):
         """ DOCSTRING """
 
-        for triangle, color in zip(self.triangles(), self.fill_color):
-            self.order.extend(triangle.fill(color))
+        for tri, color in zip(self.tris, self.fill_color):
+            self.order.extend(fill_triangle(TriangleView(*tri), color))
 
     def _draw(self, canvas):
         """ DOCSTRING """
 
+        # Shading refills order for the current pose on every draw
+        self.order.items.clear()
+        self.lines.reset()
 
+        self._apply_modelview()
+        self._cull()
         self.project(canvas)
 
-        # Scale into view
-        self.translate(x=1.0, y=1.0)# [-1, 1] -> [0,2]
-        self.translate(x=0.5*canvas.width, y=0.5*canvas.height, z=1.0, method="mul")
-
         self.sort()
 
         for texture in self.textures:
@@ -259,56 +377,181 @@ class Mesh:
 
         for line in self.order:
             line._draw(canvas.canvas)
+        self.lines._draw(canvas.canvas)
 
-def w_pad(point):
+def optimize_vertex_cache(faces, n_vertices, cache_size=32):
     """ DOCSTRING """
-    if len(point.shape) == 2: # Single point
-        point = point.reshape((1, 3, 1))
-    c, r, _ = point.shape
-    return np.append(point, np.ones((c, r, 1)), axis=-1)
-
-def w_matmul(i, j, pad=True):
+    # Tom Forsyth's linear-speed vertex cache optimisation: greedily emit the
+    # triangle whose vertices are most recently used / least shared so that
+    # neighbouring triangles in the buffer reuse the same vertices
+    # https://tomforsyth1000.github.io/papers/fast_vert_cache_opt.html
+    faces_list = np.asarray(faces).tolist()
+    vert_tris = [[] for _ in range(n_vertices)]
+    for t, face in enumerate(faces_list):
+        for v in face:
+            vert_tris[v].append(t)
+
+    cache_pos = [-1] * n_vertices
+
+    def vertex_score(v):
+        remaining = len(vert_tris[v])
+        if not remaining:
+            return -1.0
+        pos = cache_pos[v]
+        if pos < 0:
+            score = 0.0
+        elif pos < 3:
+            score = 0.75
+        else:
+            score = (1.0 - (pos - 3) / (cache_size - 3)) ** 1.5
+        return score + 2.0 * remaining ** -0.5
+
+    v_score = [vertex_score(v) for v in range(n_vertices)]
+    t_score = [sum(v_score[v] for v in face) for face in faces_list]
+    emitted = [False] * len(faces_list)
+
+    order, cache = [], []
+    best = int(np.argmax(t_score)) if faces_list else None
+    while best is not None:
+        emitted[best] = True
+        order.append(best)
+        face = faces_list[best]
+        for v in face:
+            vert_tris[v].remove(best)
+
+        cache = face + [v for v in cache if v not in face]
+        evicted, cache = cache[cache_size:], cache[:cache_size]
+        for pos, v in enumerate(cache):
+            cache_pos[v] = pos
+        for v in evicted:
+            cache_pos[v] = -1
+
+        for v in cache + evicted:
+            v_score[v] = vertex_score(v)
+
+        best, best_score = None, -1.0
+        for v in cache + evicted:
+            for t in vert_tris[v]:
+                t_score[t] = sum(v_score[u] for u in faces_list[t])
+                if v in cache and t_score[t] > best_score:
+                    best, best_score = t, t_score[t]
+
+        if best is None and len(order) < len(faces_list):
+            best = max((t for t, done in enumerate(emitted) if not done),
+                       key=t_score.__getitem__)
+
+    return np.asarray(faces)[order]
+
+def w_matmul(i, j, out=None):
     """ DOCSTRING """
-    if pad:
-        i = w_pad(i)
-    o = i @ j
-    i, w = o[:,:,:3], o[:,:,-1].reshape((-1, 3, 1))
-    w = np.where(w==0, 1, w)
-    return i / w
+    if njit is not None and j.shape == (4, 4):
+        if out is None:
+            out = np.empty(i.shape, dtype=np.result_type(i, j))
+        matmul4x4(i.reshape((-1, 4)), j, out.reshape((-1, 4)))
+        o = out
+    else:
+        o = np.matmul(i, j, out=out)
+    w = o[..., 3:]
+    np.divide(o[..., :3], w, out=o[..., :3], where=w!=0)
+    o[..., 3] = 1.0
+    return o
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True)
+    def matmul4x4(V, M, out):
+        """ DOCSTRING """
+        # Unrolled (N, 4) @ (4, 4); avoids BLAS dispatch on tiny meshes
+        for i in prange(V.shape[0]):
+            x, y, z, w = V[i, 0], V[i, 1], V[i, 2], V[i, 3]
+            out[i, 0] = x*M[0, 0] + y*M[1, 0] + z*M[2, 0] + w*M[3, 0]
+            out[i, 1] = x*M[0, 1] + y*M[1, 1] + z*M[2, 1] + w*M[3, 1]
+            out[i, 2] = x*M[0, 2] + y*M[1, 2] + z*M[2, 2] + w*M[3, 2]
+            out[i, 3] = x*M[0, 3] + y*M[1, 3] + z*M[2, 3] + w*M[3, 3]
+        return out
+
+def _transform_mesh(V, I, M, cam, out, visible):
+    """ DOCSTRING """
+    w_matmul(V, M, out=out)
+    # Culling only needs the sign of normal . (v0 - cam), so the normal is
+    # neither materialized nor normalized
+    v0, v1, v2 = out[I[:, 0], :3], out[I[:, 1], :3], out[I[:, 2], :3]
+    e1 = v1 - v0
+    e2 = v2 - v0
+    d = v0 - cam
+    sign = ((e1[:,1]*e2[:,2] - e1[:,2]*e2[:,1])*d[:,0]
+            + (e1[:,2]*e2[:,0] - e1[:,0]*e2[:,2])*d[:,1]
+            + (e1[:,0]*e2[:,1] - e1[:,1]*e2[:,0])*d[:,2])
+    np.less(sign, 0.0, out=visible)
+
+if njit is None:
+    transform_mesh = _transform_mesh
+else:
+    @njit(parallel=True, fastmath=True)
+    def transform_mesh(V, I, M, cam, out, visible):
+        """ DOCSTRING """
+        # Matmul and perspective divide over unique vertices, then a
+        # visibility pass over the triangles indexing them
+        for v in prange(V.shape[0]):
+            for c in range(4):
+                out[v, c] = (V[v, 0]*M[0, c] + V[v, 1]*M[1, c]
+                             + V[v, 2]*M[2, c] + V[v, 3]*M[3, c])
+            w = out[v, 3]
+            if w != 0.0:
+                out[v, 0] /= w
+                out[v, 1] /= w
+                out[v, 2] /= w
+            out[v, 3] = 1.0
+
+        for t in prange(I.shape[0]):
+            a, b, c = I[t, 0], I[t, 1], I[t, 2]
+            ax = out[b, 0] - out[a, 0]
+            ay = out[b, 1] - out[a, 1]
+            az = out[b, 2] - out[a, 2]
+            bx = out[c, 0] - out[a, 0]
+            by = out[c, 1] - out[a, 1]
+            bz = out[c, 2] - out[a, 2]
+
+            visible[t] = ((ay*bz - az*by)*(out[a, 0] - cam[0])
+                          + (az*bx - ax*bz)*(out[a, 1] - cam[1])
+                          + (ax*by - ay*bx)*(out[a, 2] - cam[2])) < 0.0
+
+vCamera = vec3d(0.0, 0.0, 0.0)
+meshCube = Mesh(
+    # South
+    ((0.0, 0.0, 0.0), (0.0, 1.0, 0.0), (1.0, 1.0, 0.0)),
+    ((0.0, 0.0, 0.0), (1.0, 1.0, 0.0), (1.0, 0.0, 0.0)),
+
+    # East
+    ((1.0, 0.0, 0.0), (1.0, 1.0, 0.0), (1.0, 1.0, 1.0)),
+    ((1.0, 0.0, 0.0), (1.0, 1.0, 1.0), (1.0, 0.0, 1.0)),
+
+    # North
+    ((1.0, 0.0, 1.0), (1.0, 1.0, 1.0), (0.0, 1.0, 1.0)),
+    ((1.0, 0.0, 1.0), (0.0, 1.0, 1.0), (0.0, 0.0, 1.0)),
+
+    # West
+    ((0.0, 0.0, 1.0), (0.0, 1.0, 1.0), (0.0, 1.0, 0.0)),
+    ((0.0, 0.0, 1.0), (0.0, 1.0, 0.0), (0.0, 0.0, 0.0)),
+
+    # Top
+    ((0.0, 1.0, 0.0), (0.0, 1.0, 1.0), (1.0, 1.0, 1.0)),
+    ((0.0, 1.0, 0.0), (1.0, 1.0, 1.0), (1.0, 1.0, 0.0)),
+
+    # Bottom
+    ((1.0, 0.0, 1.0), (0.0, 0.0, 1.0), (0.0, 0.0, 0.0)),
+    ((1.0, 0.0, 1.0), (0.0, 0.0, 0.0), (1.0, 0.0, 0.0)),
+    )
+
+# meshCube = Mesh()
+# meshCube.from_obj("./tulip.obj")
+
+snap = meshCube.snapshot()
 
 for i in range(10):
     canvas = display.Frame(Width, Height)
     canvas.mat_project = matProj
 
-    vCamera = vec3d(0.0, 0.0, 0.0)
-    meshCube = Mesh(
-        # South
-        Triangle(vec3d(0.0, 0.0, 0.0), vec3d(0.0, 1.0, 0.0), vec3d(1.0, 1.0, 0.0)),
-        Triangle(vec3d(0.0, 0.0, 0.0), vec3d(1.0, 1.0, 0.0), vec3d(1.0, 0.0, 0.0)),
-
-        # East
-        Triangle(vec3d(1.0, 0.0, 0.0), vec3d(1.0, 1.0, 0.0), vec3d(1.0, 1.0, 1.0)),
-        Triangle(vec3d(1.0, 0.0, 0.0), vec3d(1.0, 1.0, 1.0), vec3d(1.0, 0.0, 1.0)),
-
-        # North
-        Triangle(vec3d(1.0, 0.0, 1.0), vec3d(1.0, 1.0, 1.0), vec3d(0.0, 1.0, 1.0)),
-        Triangle(vec3d(1.0, 0.0, 1.0), vec3d(0.0, 1.0, 1.0), vec3d(0.0, 0.0, 1.0)),
-
-        # West
-        Triangle(vec3d(0.0, 0.0, 1.0), vec3d(0.0, 1.0, 1.0), vec3d(0.0, 1.0, 0.0)),
-        Triangle(vec3d(0.0, 0.0, 1.0), vec3d(0.0, 1.0, 0.0), vec3d(0.0, 0.0, 0.0)),
-
-        # Top
-        Triangle(vec3d(0.0, 1.0, 0.0), vec3d(0.0, 1.0, 1.0), vec3d(1.0, 1.0, 1.0)),
-        Triangle(vec3d(0.0, 1.0, 0.0), vec3d(1.0, 1.0, 1.0), vec3d(1.0, 1.0, 0.0)),
-
-        # Bottom
-        Triangle(vec3d(1.0, 0.0, 1.0), vec3d(0.0, 0.0, 1.0), vec3d(0.0, 0.0, 0.0)),
-        Triangle(vec3d(1.0, 0.0, 1.0), vec3d(0.0, 0.0, 0.0), vec3d(1.0, 0.0, 0.0)),
-        )
-
-    # meshCube = Mesh()
-    # meshCube.from_obj("./tulip.obj")
+    meshCube.restore(snap)
 
     meshCube.rotate('z', fTheta+i*0.1)
     # meshCube.rotate('y', fTheta+i*0.1)
@@ -12,7 +12,7 @@ import numpy as np
 from tqdm import tqdm
 
 from minimal.display import Canvas, Frame
-from minimal.objects import Line, Image
+from minimal.objects import LineBatch, Image
 
 template = Image("./snake.png")
 template.resize((500, 700))
@@ -24,19 +24,18 @@ canvas = Canvas(700, 900, bg=Color(hex="#000000"))
 n = 75
 
 def generate_pairs(leaf, n=100):
-    pairs = []
-    for _ in range(n):
-        pairs.append((leaf[np.random.randint(0, len(leaf))], leaf[np.random.randint(0, len(leaf))]))
-    return pairs
+    # (n, 2, 2) array of start/stop points drawn from the leaf outline
+    return np.asarray(leaf, dtype=np.int32)[np.random.randint(0, len(leaf), size=(n, 2))]
 
-def add_leaf(pairs, colors, surface, n=100, scale=10, repeat=True, random=True, div=50):
-    for pair in pairs:
-        line = Line(pair[0], pair[1], div=div, color=Color(hex=colors[0]))
-        line.noise(scale=scale, method="simplex")
-        line.gradient(colors[1], div, (1, 0))
-        if repeat:
-            line.repeat(random=random)
-        surface.add(line)
+def add_leaf(pairs, colors, surface, n=100, scale=10, repeat=True, random=True, div=50,
+             displacement=None):
+    lines = LineBatch(pairs, div=div, color=Color(hex=colors[0]), displacement=displacement)
+    if displacement is None:
+        lines.noise(scale=scale, method="simplex")
+    lines.gradient(colors[1], div, (1, 0))
+    if repeat:
+        lines.repeat(random=random)
+    surface.add(lines)
 
 colors1 = ["#B7E4C7", "#D8F3DC"]
 leaf1 = [(363, 799),
@@ -282,17 +281,20 @@ pairs9 = generate_pairs(leaf9, n)
 white = Color(hex="#FFFFFF")
 bg_colors = [col for col in white.range_to("#000000", 501)]
 
+# Only the noise scale changes between frames, so sample each leaf's noise
+# field once and scale it per frame. The field samples y independently of x
+# at the undisplaced points, so its y displacement is not the one
+# lines.noise(scale=j) would apply
+leaves = [(pairs1, colors1), (pairs3, colors3), (pairs2, colors2),
+          (pairs4, colors4), (pairs6, colors6), (pairs5, colors5),
+          (pairs7, colors7), (pairs9, colors9), (pairs8, colors8)]
+fields = [LineBatch(pairs, div=50).noise_field() for pairs, _ in leaves]
+
 for i, j in tqdm(enumerate(np.linspace(1, 50, 501)), total=len(bg_colors)):
     frame = Frame(700, 900, bg=bg_colors[i])
-    add_leaf(pairs1, colors1, frame, n=100, scale=j, div=50, repeat=False)
-    add_leaf(pairs3, colors3, frame, n=100, scale=j, div=50, repeat=False)
-    add_leaf(pairs2, colors2, frame, n=100, scale=j, div=50, repeat=False)
-    add_leaf(pairs4, colors4, frame, n=100, scale=j, div=50, repeat=False)
-    add_leaf(pairs6, colors6, frame, n=100, scale=j, div=50, repeat=False)
-    add_leaf(pairs5, colors5, frame, n=100, scale=j, div=50, repeat=False)
-    add_leaf(pairs7, colors7, frame, n=100, scale=j, div=50, repeat=False)
-    add_leaf(pairs9, colors9, frame, n=100, scale=j, div=50, repeat=False)
-    add_leaf(pairs8, colors8, frame, n=100, scale=j, div=50, repeat=False)
+    for (pairs, colors), field in zip(leaves, fields):
+        add_leaf(pairs, colors, frame, n=100, div=50, repeat=False,
+                 displacement=field*j)
     canvas.add(frame)
 
 canvas.show(inspect=False)
\ No newline at end of file
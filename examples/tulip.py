@@ -3,480 +3,466 @@
 Tulip Case Study
 """
 
-from os.path import abspath, dirname
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import hashlib
+import os
+from os.path import abspath, dirname, join
+import re
 import sys
 sys.path.insert(0, dirname(dirname(abspath(__file__))))
 
 from colour import Color
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError: # Falls back to the broadcast NumPy shader
+    njit = None
+
 from minimal.display import Canvas
-from minimal.objects import Line
 
 
 canvas = Canvas(800, 800, fps=60, bg=Color(hex="#FFFFFF"))
 
-# Shading Leaf Right
-segments = []
-alphas = []
-line_widths = []
-
-def repeated_shader(base, repeat_cond, range_args, 
-                    segments, alphas, line_widths,
-                    alpha=1, line_width=1, random_cond=(-10, 10)):
-    
-    base = np.array(base)
+def _shader(base, placement, random, out):
+    # out[k] = base - placement[k] + random[k] for each i in range
+    for k in range(out.shape[0]):
+        for p in range(base.shape[0]):
+            out[k, p, 0] = base[p, 0] - placement[k, 0] + random[k, 0]
+            out[k, p, 1] = base[p, 1] - placement[k, 1] + random[k, 1]
+    return out
+
+if njit is not None:
+    # cache=True keeps the compiled kernel in __pycache__ between runs, and
+    # nogil=True lets ShaderBlock run it for several specs at once
+    _shader = njit(fastmath=True, cache=True, nogil=True)(_shader)
+
+def _shader_numpy(base, placement, random, out):
+    # Same as _shader, broadcast over every i at once and written straight
+    # into out rather than through two temporaries
+    np.subtract(base[np.newaxis, :, :], placement[:, np.newaxis, :], out=out)
+    np.add(out, random[:, np.newaxis, :], out=out)
+    return out
+
+_TERM = re.compile(r"([+-]?)(?:([\d.]+)\*)?(i|[\d.]+)")
+_COEFFICIENTS = {}
+
+def _coefficients(repeat_cond):
+    # Every repeat_cond is linear in i, e.g. "[i-0.7*i,i+i]", so it is parsed
+    # once into (a, b) such that placement = (a*i, b*i). Only ~20 distinct
+    # conditions appear below, each is parsed on first use only
+    if repeat_cond in _COEFFICIENTS:
+        return _COEFFICIENTS[repeat_cond]
+
+    coefficients = []
+    for expr in repeat_cond.strip("[]").replace(" ", "").split(","):
+        c = 0.0
+        for sign, mul, sym in _TERM.findall(expr):
+            if sym != "i":
+                if float(sym) != 0:
+                    raise ValueError(f"repeat_cond must be linear in i; provided {repeat_cond}")
+                continue
+            c += float(mul or 1) * (-1 if sign == "-" else 1)
+        coefficients.append(c)
+    _COEFFICIENTS[repeat_cond] = tuple(coefficients)
+    return _COEFFICIENTS[repeat_cond]
+
+_PLACEMENTS = {}
+
+def _placement(repeat_cond, range_args):
+    # (len(range), 2) shifts for either a condition string or a callable such
+    # as lambda i: (0.3*i, 2*i), which is called once on the whole i array
+    r = range(*range_args)
+    if callable(repeat_cond):
+        x, y = np.broadcast_arrays(*repeat_cond(np.arange(*range_args, dtype=np.float32)))
+        return np.stack((x, y), axis=1).astype(np.float32, copy=False)
+
+    coefficients = np.array(_coefficients(repeat_cond), dtype=np.float32)
+    if r.start < 0 or r.step < 0:
+        return np.multiply.outer(np.arange(*range_args, dtype=np.float32), coefficients)
+
+    # Shifts of a condition for i = 0, 1, ... are computed once, up to the
+    # largest stop seen, and every range using it takes a slice
+    table = _PLACEMENTS.get(repeat_cond)
+    if table is None or len(table) < r.stop:
+        table = np.multiply.outer(np.arange(r.stop, dtype=np.float32), coefficients)
+        _PLACEMENTS[repeat_cond] = table
+    return table[r.start:r.stop:r.step]
+
+_rng = np.random.default_rng()
+
+def _noise_dtype(low, high):
+    # Smallest integer type holding low..high; int8 for the usual (-10, 10),
+    # the kernels promote while adding it to the float32 points
+    for dtype in (np.int8, np.int16, np.int32):
+        if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+def repeated_shader(base, repeat_cond, range_args, out, random_cond=(-10, 10), rng=_rng, random=None):
+    """ Writes base shifted by repeat_cond plus noise for each i into out """
     
-    for i in range(*range_args):
-        _base = base.copy()
-        placement = np.array(eval(repeat_cond))
-        random = np.random.randint(*random_cond, size=2)
-        
-        _base = _base - placement + random
+    # No-op for the packed ALL_POINTS views; converts plain point lists
+    base = np.asarray(base, dtype=np.float32)
+    r = range(*range_args)
+    placement = _placement(repeat_cond, range_args)
+    # One draw for every offset instead of a call per iteration, unless the
+    # caller drew it already; a (0, 0) random_cond (which integers would
+    # reject) adds a zero-stride zero view
+    if random is None:
+        if random_cond[0] == 0 and random_cond[1] == 0:
+            random = np.broadcast_to(np.float32(0), (len(r), 2))
+        else:
+            random = rng.integers(*random_cond, size=(len(r), 2),
+                                  dtype=_noise_dtype(random_cond[0], random_cond[1] - 1))
     
-        segments.append(_base.tolist())
-        alphas.append(alpha)
-        line_widths.append(line_width)
-    
-    return segments, alphas, line_widths
-
-# Top Right
-
-l1 = [(501, 651), (503, 641), (507, 635), (511, 629), (512, 626), (515, 617), (518, 612)]
-
-shades, alphas, line_widths = repeated_shader(l1, "[i-0.7*i,i+i]", (0, 66, 2), 
-                                              segments, alphas, line_widths,
-                                              alpha=1, line_width=1.5)
-
-l2 = [(503, 646), (505, 641), (510, 635), (513, 626), (517, 617), (519, 609), 
-        (523, 602), (526, 596), (528, 588), (533, 578)]
-
-shades, alphas, line_widths = repeated_shader(l2, "[i-0.7*i,i+i]", (0, 70, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.75, line_width=1)
+    if njit is not None:
+        _shader(base, placement, random, out)
+    else:
+        _shader_numpy(base, placement, random, out)
     
-l3 = [(535, 573), (537, 563), (539, 557), (542, 549), (545, 541), (548, 535), 
-          (551, 528), (555, 521), (559, 512)]
+    return out
+
+@lru_cache(maxsize=None)
+def _seeded_shader(base_bytes, length, repeat_cond, range_args, random_cond, seed):
+    # Geometry of one spec for a fixed seed. Specs that share a base, condition
+    # and range, differing only in alpha or line width, are computed once
+    base = np.frombuffer(base_bytes, dtype=np.float32).reshape((length, 2))
+    out = np.empty((len(range(*range_args)), length, 2), dtype=np.float32)
+    repeated_shader(base, repeat_cond, range_args, out, random_cond,
+                    rng=np.random.default_rng(seed))
+    out.flags.writeable = False
+    return out
+
+def _spec_key(specs, seed):
+    # md5 of everything that determines the shaded points of a seeded block;
+    # None for callable conditions, whose repr is not stable between runs
+    digest = hashlib.md5(repr(seed).encode())
+    for base, repeat_cond, range_args, _, _, *random_cond in specs:
+        if callable(repeat_cond):
+            return None
+        digest.update(np.asarray(base, dtype=np.float32).tobytes())
+        digest.update(repr((repeat_cond, tuple(range_args), random_cond)).encode())
+    return digest.hexdigest()
+
+class ShaderBlock:
+    """
+    Shaded strokes of one section stored as flat buffers
+
+    Notes:
+        Rows are laid out back to back in points, row k spanning
+        offsets[k]:offsets[k+1]. Row counts are known from each spec's range,
+        so every buffer is allocated once before the shader fills it
+
+    Keyword Arguments:
+        specs (Iterable): (base, repeat_cond, range_args, alpha, line_width)
+            tuples, optionally followed by random_cond
+        seed (int, optional): Seeds the shader noise so that identical specs
+            are computed once and reused. Default: None (fresh noise per spec)
+        cache (str, optional): Directory where points of a seeded block are
+            saved as .npz, keyed by an md5 of the specs and seed, and loaded
+            from on later runs. Saved points are not invalidated when the
+            shader itself changes. Default: None (no cache)
+    """
+
+    def __init__(self, specs, seed=None, cache=None):
+
+        counts = [len(range(*spec[2])) for spec in specs]
+        lengths = [len(spec[0]) for spec in specs]
+
+        self.offsets = np.zeros(sum(counts) + 1, dtype=np.int64)
+        np.cumsum(np.repeat(lengths, counts), out=self.offsets[1:])
+        self.points = np.empty((self.offsets[-1], 2), dtype=np.float32)
+        self.alphas = np.repeat(np.array([spec[3] for spec in specs], dtype=np.float32), counts)
+        self.line_widths = np.repeat(np.array([spec[4] for spec in specs], dtype=np.float32), counts)
+
+        # (count, length, 2) rows of each spec with its alpha and line width
+        self.groups = []
+
+        # Noise for every row in one draw, each row bounded by its spec's
+        # random_cond; a (0, 0) condition gets the bounds (0, 1), i.e. zeros
+        if seed is None:
+            conds = [tuple(spec[5]) if len(spec) > 5 else (-10, 10) for spec in specs]
+            lows = np.repeat([low for low, _ in conds], counts)[:, None]
+            highs = np.repeat([max(high, low + 1) for low, high in conds], counts)[:, None]
+            noise = _rng.integers(lows, highs, size=(len(lows), 2),
+                                  dtype=_noise_dtype(lows.min(), highs.max() - 1))
+
+        def fill(job):
+            (base, repeat_cond, range_args, _, _, *random_cond), out, row = job
+            if seed is None:
+                repeated_shader(base, repeat_cond, range_args, out,
+                                random=noise[row:row + len(out)])
+            else:
+                random_cond = tuple(random_cond[0]) if random_cond else (-10, 10)
+                # Bytes of float32 points, as _seeded_shader reads them back
+                base = np.asarray(base, dtype=np.float32)
+                out[...] = _seeded_shader(base.tobytes(), len(base), repeat_cond,
+                                          tuple(range_args), random_cond, seed)
+
+        jobs = []
+        row = 0
+        for spec, count, length in zip(specs, counts, lengths):
+            start = self.offsets[row]
+            out = self.points[start:start + count*length].reshape((count, length, 2))
+            jobs.append((spec, out, row))
+            self.groups.append((out, spec[3], spec[4]))
+            row += count
+
+        key = _spec_key(specs, seed) if seed is not None and cache else None
+        path = key and join(cache, key + ".npz")
+        if path and os.path.exists(path):
+            with np.load(path) as saved:
+                self.points[...] = saved["points"]
+            return
+
+        # Specs fill disjoint slices of points with noise drawn above, so they
+        # run in threads; the numba kernel and NumPy ufuncs release the GIL
+        with ThreadPoolExecutor() as pool:
+            list(pool.map(fill, jobs))
+
+        if path:
+            os.makedirs(cache, exist_ok=True)
+            np.savez_compressed(path, points=self.points)
+
+    def __len__(self):
+        return len(self.alphas)
+
+    def __iter__(self):
+        for k in range(len(self)):
+            yield (self.points[self.offsets[k]:self.offsets[k+1]],
+                   self.alphas[k], self.line_widths[k])
+
+def pack_points(shader_specs):
+    """ Packs every spec outline into one buffer, swapping bases for views """
+
+    specs = [(key, k, spec) for key, group in shader_specs.items()
+             for k, spec in enumerate(group)]
+    # float32 is plenty for 800 x 800 canvas coordinates
+    points = np.array([pt for _, _, spec in specs for pt in spec[0]], dtype=np.float32)
+
+    spans = {}
+    stop = 0
+    for key, k, (base, *spec) in specs:
+        start, stop = stop, stop + len(base)
+        spans[key, k] = (start, stop)
+        shader_specs[key][k] = (points[start:stop], *spec)
+    return points, spans
+
+SHADER_SPECS = {
+    # Right Leaf
+    "leaf_right_top": [
+        (((501, 651), (503, 641), (507, 635), (511, 629), (512, 626), (515, 617), (518, 612)),
+         "[i-0.7*i,i+i]", (0, 66, 2), 1, 1.5),
+        (((503, 646), (505, 641), (510, 635), (513, 626), (517, 617), (519, 609),
+          (523, 602), (526, 596), (528, 588), (533, 578)),
+         "[i-0.7*i,i+i]", (0, 70, 1), 0.75, 1),
+        (((535, 573), (537, 563), (539, 557), (542, 549), (545, 541), (548, 535),
+          (551, 528), (555, 521), (559, 512)),
+         "[i-0.7*i,i+i]", (0, 60, 1), 0.65, 0.8),
+        (((562, 492), (566, 480), (569, 470), (573, 460), (576, 449), (580, 438), (583, 427)),
+         "[i-0.7*i,i+i]", (0, 53, 1), 0.55, 0.65),
+        (((587, 399), (588, 384), (590, 368), (593, 354), (596, 341)),
+         "[i-0.7*i,i+i]", (0, 53, 1), 0.45, 0.5),
+    ],
+    "leaf_right_bottom": [
+        (((520, 722), (527, 713), (533, 702), (539, 693), (547, 681), (553, 669),
+          (561, 656), (566, 643), (571, 633), (575, 625), (578, 611), (582, 603), (587, 590)),
+         "[i-0.4*i,i-0.5*i]", (0, 20, 1), 1, 1),
+        (((509, 711), (518, 698), (521, 690), (526, 681), (532, 670), (538, 661),
+          (543, 652), (548, 641), (552, 633), (556, 624), (560, 611), (564, 604),
+          (568, 593), (571, 586), (576, 576)),
+         "[i-0.4*i,i-0.5*i]", (0, 40, 2), 0.4, 0.4),
+        (((592, 585), (601, 572), (607, 556), (609, 536), (614, 519), (622, 499),
+          (626, 477), (630, 463)),
+         "[i-0.4*i,i-0.5*i]", (0, 30, 1), 0.7, 0.7),
+        (((571, 573), (576, 560), (583, 546), (587, 535), (591, 519), (595, 505),
+          (601, 488), (604, 475), (607, 464), (610, 453)),
+         "[i-0.4*i,i-0.5*i]", (0, 40, 2), 0.4, 0.4),
+        (((630, 450), (630, 438), (630, 421), (630, 407), (631, 392), (630, 371), (629, 344)),
+         "[i-0.4*i,i-0.5*i]", (0, 20, 1), 0.6, 0.6),
+        (((611, 452), (611, 434), (612, 416), (613, 398), (614, 385), (615, 372),
+          (615, 362), (615, 348)),
+         "[i-0.4*i,i-0.5*i]", (0, 40, 2), 0.3, 0.3),
+        (((630, 345), (625, 330), (622, 313), (618, 297), (614, 283), (610, 260)),
+         "[i-0.4*i,i-0.5*i]", (0, 20, 1), 0.6, 0.6),
+        (((607, 259), (599, 248), (590, 238), (583, 231), (575, 225)),
+         "[i-1.5*i,i-1.5*i]", (0, 10, 1), 0.6, 0.6),
+    ],
+    # Left Leaf
+    "leaf_left_bottom": [
+        (((451, 745), (443, 736), (437, 726), (433, 719), (427, 710), (421, 700),
+          (417, 694), (409, 684), (403, 675), (397, 667), (392, 662), (387, 655),
+          (377, 648), (372, 639), (367, 634), (357, 625), (353, 614), (346, 608),
+          (339, 598), (332, 589)),
+         "[i-1.5*i,i-0.5*i]", (0, 20, 1), 1, 1),
+        (((336, 594), (330, 575), (327, 568), (325, 554), (323, 544), (320, 532),
+          (317, 519), (314, 508), (310, 497), (309, 487)),
+         "[i-1.5*i,i-0.5*i]", (0, 20, 1), 0.8, 0.8),
+        (((307, 482), (307, 470), (307, 454), (306, 443), (304, 429), (304, 415), (306, 410)),
+         "[i-1*i,i-0.5*i]", (0, 20, 1), 1, 1),
+        (((473, 736), (464, 722), (454, 710), (448, 700), (440, 689), (431, 675),
+          (422, 662), (416, 655), (410, 649)),
+         "[i-2*i,i-0.5*i]", (0, 30, 1), 0.2, 1),
+        (((409, 649), (401, 639), (393, 629), (385, 621), (378, 612), (372, 605),
+          (366, 596), (359, 586), (348, 574)),
+         "[i-2*i,i-0.5*i]", (0, 60, 1), 0.05, 1),
+        (((346, 567), (341, 554), (338, 543), (336, 528), (332, 518), (331, 509),
+          (327, 499), (325, 490)),
+         "[i-2*i,i-0.5*i]", (0, 30, 1), 0.05, 1),
+        (((333, 502), (330, 496), (328, 485), (325, 477), (322, 465), (319, 457),
+          (319, 449), (316, 438), (315, 430), (315, 423)),
+         "[i-1.25*i,i-0.5*i]", (0, 20, 1), 0.6, 1),
+        (((447, 617), (441, 605), (433, 595), (427, 588), (421, 578), (417, 571),
+          (411, 563), (404, 550), (398, 542), (392, 536), (386, 528), (377, 517),
+          (374, 513), (367, 504), (361, 499), (357, 494), (354, 489), (345, 481),
+          (341, 475), (336, 470)),
+         "[i-1.25*i,i-0.5*i]", (0, 20, 1), 0.4, 1),
+        (((393, 574), (383, 561), (376, 554), (370, 545), (364, 539), (357, 531),
+          (352, 523), (346, 514)),
+         "[i-1.25*i,i-0.5*i]", (0, 20, 1), 0.15, 1),
+        (((380, 624), (375, 617), (369, 611), (363, 604), (359, 596), (353, 590),
+          (350, 584), (345, 576)),
+         "[i-1.25*i,i-0.5*i]", (0, 20, 1), 0.15, 1),
+    ],
+    "leaf_left_top": [
+        (((487, 688), (482, 675), (478, 667), (473, 656), (468, 643), (466, 636),
+          (463, 625), (460, 615), (456, 605), (452, 597), (448, 591)),
+         "[i-1.25*i,i-0.5*i]", (0, 20, 1), 0.5, 1),
+        (((447, 585), (442, 578), (436, 572), (431, 563), (426, 557), (422, 547),
+          (419, 543), (415, 537), (406, 529)),
+         "[i-1.25*i,i-0.5*i]", (0, 20, 1), 0.25, 1),
+        (((408, 531), (405, 527), (396, 520), (389, 514), (387, 511), (381, 505), (377, 499)),
+         "[i-1.25*i,i-0.5*i]", (0, 20, 1), 0.15, 1),
+    ],
+    "stem": [
+        (((403, 343), (409, 359), (414, 374), (418, 390), (421, 403), (426, 415),
+          (429, 429), (433, 449), (437, 461), (441, 474), (444, 488), (450, 503),
+          (453, 518), (456, 531), (460, 550), (463, 564), (464, 577), (465, 593)),
+         "[i-1.25*i,i-0.5*i]", (0, 10, 1), 0.6, 1),
+        (((464, 572), (466, 585), (472, 595), (477, 608), (478, 617), (480, 631)),
+         "[i-1.25*i,i-0.5*i]", (0, 10, 1), 0.4, 1),
+        (((411, 339), (414, 354), (421, 372), (422, 383), (425, 395), (433, 410),
+          (434, 423), (438, 438), (444, 455), (446, 469), (452, 485), (457, 498),
+          (461, 513), (465, 525), (469, 544), (472, 555), (474, 565), (476, 579),
+          (478, 589)),
+         "[i-1.5*i,i-0.5*i]", (0, 30, 1), 0.05, 1),
+    ],
+    # Petals
+    "petal_left": [
+        (((306, 316), (295, 313), (286, 308), (273, 302), (259, 295), (245, 284),
+          (236, 276), (226, 263), (216, 252), (208, 240), (203, 229), (198, 221),
+          (192, 213), (186, 200), (178, 180), (175, 171), (171, 161), (168, 151), (166, 147)),
+         "[i-1.25*i,i-0.5*i]", (0, 7, 1), 0.85, 1),
+        (((295, 302), (286, 299), (275, 296), (260, 289), (249, 281), (243, 272),
+          (233, 262), (229, 254)),
+         "[i-1.5*i,i-0.5*i]", (0, 15, 1), 0.35, 1),
+        (((308, 296), (298, 291), (285, 284), (275, 277), (265, 271), (259, 266),
+          (251, 257), (245, 250), (235, 242), (227, 231), (220, 220), (214, 208),
+          (208, 194), (202, 177), (195, 165)),
+         "[i-1.5*i,i-0.5*i]", (0, 2, 1), 0.4, 1),
+        (((403, 322), (391, 323), (377, 324), (368, 324), (358, 324), (343, 321),
+          (335, 321), (322, 318)),
+         "[i-0.75*i,i-0.5*i]", (0, 10, 1), 0.8, 1),
+        (((372, 320), (360, 317), (351, 312), (341, 304), (335, 299)),
+         "[i-0.25*i,i-0.5*i]", (0, 10, 1), 0.8, 1),
+        (((272, 243), (262, 234), (254, 225), (248, 217), (241, 210), (234, 200),
+          (229, 191), (222, 184), (218, 173), (212, 160)),
+         "[i-0.25*i,i-0.5*i]", (0, 2, 1), 0.25, 1),
+        (((343, 300), (335, 292), (327, 285), (320, 280), (314, 276), (302, 264), (294, 253)),
+         "[i-0.25*i,i-0.5*i]", (0, 10, 1), 0.4, 1),
+        (((286, 235), (280, 226), (272, 215), (263, 201), (259, 188), (255, 179),
+          (249, 169), (246, 160), (240, 145), (235, 128)),
+         "[i-2.5*i,i-0.5*i]", (0, 5, 1), 1, 1, (-5, 5)),
+        (((397, 327), (390, 327), (379, 327), (370, 327), (355, 327), (341, 326),
+          (328, 323), (315, 320), (296, 317), (284, 311), (267, 305), (260, 301),
+          (252, 295), (242, 288), (236, 282), (230, 276), (222, 268), (214, 256),
+          (208, 246), (202, 239), (197, 226), (188, 212), (181, 197), (178, 183),
+          (174, 172), (168, 156), (164, 145), (163, 133), (161, 120), (161, 105)),
+         "[i-2*i,i-0.5*i]", (0, 60, 1), 0.05, 1),
+    ],
+    "petal_back_left": [
+        (((257, 157), (253, 146), (251, 136), (247, 125), (245, 115), (243, 102),
+          (240, 91), (238, 80), (237, 76), (236, 69)),
+         "[i-0.25*i,i-0.5*i]", (0, 10, 1), 0.3, 1),
+        (((232, 113), (230, 106), (229, 98), (228, 95), (226, 89)),
+         "[i+0.25*i,i-0.5*i]", (0, 10, 1), 0.3, 1),
+        (((259, 137), (254, 125), (251, 115), (249, 105), (247, 97), (245, 89), (243, 83)),
+         "[i-2.5*i,2*i]", (0, 20, 1), 0.3, 1),
+    ],
+    "petal_right": [
+        (((489, 255), (489, 243), (489, 230), (484, 215), (480, 203), (478, 194),
+          (473, 186), (467, 174), (459, 162), (456, 152), (450, 138), (445, 128),
+          (439, 114), (432, 102), (423, 91), (418, 86), (409, 76)),
+         "[i-1.25*i,2*i]", (0, 40, 1), 0.1, 1),
+        (((462, 280), (471, 273), (478, 261), (484, 252), (489, 245), (493, 237),
+          (501, 225), (505, 219), (511, 207)),
+         "[i,i-2*i]", (0, 20, 1), 0.4, 1),
+        (((484, 229), (484, 221), (481, 208), (477, 197), (472, 183)),
+         "[i-1.5*i,i]", (0, 40, 1), 0.275, 1),
+    ],
+    "petal_back_right": [
+        (((316, 72), (313, 64), (308, 60), (302, 53), (293, 51)),
+         "[i-2.25*i,0.75*i]", (0, 40, 2), 0.3, 1),
+        (((387, 61), (390, 51), (390, 41), (390, 30), (386, 20)),
+         "[i-2*i,i-2*i]", (0, 20, 2), 0.3, 1),
+    ],
+    "petal_middle": [
+        (((439, 305), (434, 305), (424, 305), (416, 305), (411, 305), (402, 305),
+          (393, 305), (383, 303), (372, 301), (363, 299), (350, 295), (340, 290)),
+         "[0,0.25*i]", (0, 40, 2), 0.3, 1),
+        (((381, 285), (366, 281), (353, 275), (339, 268), (328, 259), (315, 246),
+          (304, 236), (295, 223), (283, 209), (275, 198), (268, 184)),
+         "[i-2*i,0.25*i]", (0, 40, 2), 0.2, 1),
+        (((344, 221), (332, 211), (324, 197), (315, 180), (307, 163), (300, 152),
+          (297, 135), (294, 116)),
+         "[i-4*i,0.25*i]", (0, 20, 2), 0.2, 1),
+        (((426, 264), (425, 245), (422, 221), (417, 204), (413, 175), (408, 155),
+          (400, 134), (387, 104)),
+         "[i-2*i,0.25*i]", (0, 30, 2), 0.3, 1),
+    ],
+    "petal_outline": [
+        (((265, 173), (269, 152), (270, 132), (274, 117), (281, 101), (293, 86), (305, 81)),
+         "[i+1*i,0.25*i]", (0, 5, 1), 0.6, 1),
+        (((443, 139), (433, 128), (428, 121), (421, 110), (414, 97), (407, 90),
+          (398, 80), (393, 73), (384, 69)),
+         "[i-1*i,0.25*i]", (0, 7, 1), 0.6, 1),
+        (((416, 76), (416, 66), (419, 52), (422, 40), (428, 30), (432, 22)),
+         "[i-1*i,0.25*i]", (0, 7, 1), 0.6, 1),
+        (((238, 141), (230, 130), (220, 126), (204, 121), (192, 119), (178, 119), (169, 119)),
+         "[i-1*i,0.25*i]", (0, 21, 3), 0.6, 1),
+    ],
+}
+
+# Outlines above are constant tuples; they are converted in a single pass
+ALL_POINTS, SPANS = pack_points(SHADER_SPECS)
+
+# SHADER_SPECS keys grouped by the part of the tulip they draw
+SECTIONS = {
+    "leaves": [key for key in SHADER_SPECS if key.startswith("leaf_")],
+    "stem": ["stem"],
+    "petals": [key for key in SHADER_SPECS if key.startswith("petal_")],
+}
+
+parser = argparse.ArgumentParser(description="Tulip Case Study")
+parser.add_argument("--sections", default=",".join(SECTIONS),
+                    help="Comma separated sections to draw, any of %s" % ", ".join(SECTIONS))
+parser.add_argument("--seed", type=int, default=None,
+                    help="Seed for the shader noise; seeded shading is cached in __pycache__")
+args = parser.parse_args()
+sections = args.sections.split(",")
+for section in sections:
+    if section not in SECTIONS:
+        parser.error("unknown section %r" % section)
+
+# Every selected section shades into one block, drained by a single loop.
+# Rows of a spec share their length, so each spec is densified at once
+shading = ShaderBlock([spec for section in sections for key in SECTIONS[section]
+                       for spec in SHADER_SPECS[key]],
+                      seed=args.seed, cache=join(dirname(abspath(__file__)), "__pycache__"))
+for segments, alpha, line_width in shading.groups:
+    canvas.add_lines(segments, alpha, line_width, div=30, noise_scale=(10,10))
 
-shades, alphas, line_widths = repeated_shader(l3, "[i-0.7*i,i+i]", (0, 60, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.65, line_width=0.8)
-    
-l4 = [(562, 492), (566, 480), (569, 470), (573, 460), (576, 449), (580, 438), (583, 427)]
-shades, alphas, line_widths = repeated_shader(l4, "[i-0.7*i,i+i]", (0, 53, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.55, line_width=0.65)
-
-l5 = [(587, 399), (588, 384), (590, 368), (593, 354), (596, 341)]
-shades, alphas, line_widths = repeated_shader(l5, "[i-0.7*i,i+i]", (0, 53, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.45, line_width=0.5)
-
-for segment, alpha, line_width in zip(segments, alphas, line_widths):
-    line = Line(segments=segment, div=30, alpha=alpha, line_width=line_width)
-    canvas.add(line)
-
-# Bottom Right
-
-segments = []
-alphas = []
-line_widths = []
-
-b1 = [(520, 722), (527, 713), (533, 702), (539, 693), (547, 681), (553, 669), 
-      (561, 656), (566, 643), (571, 633), (575, 625), (578, 611), (582, 603), (587, 590)]
-
-shades, alphas, line_widths = repeated_shader(b1, "[i-0.4*i,i-0.5*i]", (0, 20, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=1, line_width=1)
-
-b2 = [(509, 711), (518, 698), (521, 690), (526, 681), (532, 670), (538, 661), 
-      (543, 652), (548, 641), (552, 633), (556, 624), (560, 611), (564, 604), 
-      (568, 593), (571, 586), (576, 576)]
-shades, alphas, line_widths = repeated_shader(b2, "[i-0.4*i,i-0.5*i]", (0, 40, 2), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.4, line_width=0.4)
-
-b3 = [(592, 585), (601, 572), (607, 556), (609, 536), (614, 519), (622, 499), 
-      (626, 477), (630, 463)]
-shades, alphas, line_widths = repeated_shader(b3, "[i-0.4*i,i-0.5*i]", (0, 30, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.7, line_width=0.7)
-
-b4 = [(571, 573), (576, 560), (583, 546), (587, 535), (591, 519), (595, 505), 
-      (601, 488), (604, 475), (607, 464), (610, 453)]
-shades, alphas, line_widths = repeated_shader(b4, "[i-0.4*i,i-0.5*i]", (0, 40, 2), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.4, line_width=0.4)
-
-b5 = [(630, 450), (630, 438), (630, 421), (630, 407), (631, 392), (630, 371), (629, 344)]
-shades, alphas, line_widths = repeated_shader(b5, "[i-0.4*i,i-0.5*i]", (0, 20, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.6, line_width=0.6)
-
-b6 = [(611, 452), (611, 434), (612, 416), (613, 398), (614, 385), (615, 372), 
-      (615, 362), (615, 348)]
-shades, alphas, line_widths = repeated_shader(b6, "[i-0.4*i,i-0.5*i]", (0, 40, 2), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.3, line_width=0.3)
-
-b7 = [(630, 345), (625, 330), (622, 313), (618, 297), (614, 283), (610, 260)]
-shades, alphas, line_widths = repeated_shader(b7, "[i-0.4*i,i-0.5*i]", (0, 20, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.6, line_width=0.6)
-
-b8 = [(607, 259), (599, 248), (590, 238), (583, 231), (575, 225)]
-shades, alphas, line_widths = repeated_shader(b8, "[i-1.5*i,i-1.5*i]", (0, 10, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.6, line_width=0.6)
-
-for segment, alpha, line_width in zip(segments, alphas, line_widths):
-    line = Line(segments=segment, div=30, alpha=alpha, line_width=line_width)
-    canvas.add(line)
-
-
-# Left Leaf
-
-segments = []
-alphas = []
-line_widths = []
-
-# Bottom
-
-b1 = [(451, 745), (443, 736), (437, 726), (433, 719), (427, 710), (421, 700), 
-      (417, 694), (409, 684), (403, 675), (397, 667), (392, 662), (387, 655), 
-      (377, 648), (372, 639), (367, 634), (357, 625), (353, 614), (346, 608), 
-      (339, 598), (332, 589)]
-shades, alphas, line_widths = repeated_shader(b1, "[i-1.5*i,i-0.5*i]", (0, 20, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=1, line_width=1)
-
-b2 = [(336, 594), (330, 575), (327, 568), (325, 554), (323, 544), (320, 532), 
-      (317, 519), (314, 508), (310, 497), (309, 487)]
-shades, alphas, line_widths = repeated_shader(b2, "[i-1.5*i,i-0.5*i]", (0, 20, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.8, line_width=0.8)
-
-b3 = [(307, 482), (307, 470), (307, 454), (306, 443), (304, 429), (304, 415), (306, 410)]
-shades, alphas, line_widths = repeated_shader(b3, "[i-1*i,i-0.5*i]", (0, 20, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=1, line_width=1)
-
-b4 = [(473, 736), (464, 722), (454, 710), (448, 700), (440, 689), (431, 675), 
-      (422, 662), (416, 655), (410, 649)]
-shades, alphas, line_widths = repeated_shader(b4, "[i-2*i,i-0.5*i]", (0, 30, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.2, line_width=1)
-
-b5 = [(409, 649), (401, 639), (393, 629), (385, 621), (378, 612), (372, 605), 
-      (366, 596), (359, 586), (348, 574)]
-shades, alphas, line_widths = repeated_shader(b5, "[i-2*i,i-0.5*i]", (0, 60, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.05, line_width=1)
-
-b6 = [(346, 567), (341, 554), (338, 543), (336, 528), (332, 518), (331, 509), 
-      (327, 499), (325, 490)]
-shades, alphas, line_widths = repeated_shader(b6, "[i-2*i,i-0.5*i]", (0, 30, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.05, line_width=1)
-b7 = [(333, 502), (330, 496), (328, 485), (325, 477), (322, 465), (319, 457), 
-      (319, 449), (316, 438), (315, 430), (315, 423)]
-shades, alphas, line_widths = repeated_shader(b7, "[i-1.25*i,i-0.5*i]", (0, 20, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.6, line_width=1)
-
-b8 = [(447, 617), (441, 605), (433, 595), (427, 588), (421, 578), (417, 571), 
-      (411, 563), (404, 550), (398, 542), (392, 536), (386, 528), (377, 517), 
-      (374, 513), (367, 504), (361, 499), (357, 494), (354, 489), (345, 481), 
-      (341, 475), (336, 470)]
-shades, alphas, line_widths = repeated_shader(b8, "[i-1.25*i,i-0.5*i]", (0, 20, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.4, line_width=1)
-
-b9 = [(393, 574), (383, 561), (376, 554), (370, 545), (364, 539), (357, 531), 
-      (352, 523), (346, 514)]
-shades, alphas, line_widths = repeated_shader(b9, "[i-1.25*i,i-0.5*i]", (0, 20, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.15, line_width=1)
-
-b10 = [(380, 624), (375, 617), (369, 611), (363, 604), (359, 596), (353, 590), 
-        (350, 584), (345, 576)]
-shades, alphas, line_widths = repeated_shader(b10, "[i-1.25*i,i-0.5*i]", (0, 20, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.15, line_width=1)
-
-for segment, alpha, line_width in zip(segments, alphas, line_widths):
-    line = Line(segments=segment, div=30, alpha=alpha, line_width=line_width)
-    canvas.add(line)
-
-
-# Top
-
-segments = []
-alphas = []
-line_widths = []
-
-t1 = [(487, 688), (482, 675), (478, 667), (473, 656), (468, 643), (466, 636), 
-      (463, 625), (460, 615), (456, 605), (452, 597), (448, 591)]
-shades, alphas, line_widths = repeated_shader(t1, "[i-1.25*i,i-0.5*i]", (0, 20, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.5, line_width=1)
-
-t2 = [(447, 585), (442, 578), (436, 572), (431, 563), (426, 557), (422, 547), 
-      (419, 543), (415, 537), (406, 529)]
-shades, alphas, line_widths = repeated_shader(t2, "[i-1.25*i,i-0.5*i]", (0, 20, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.25, line_width=1)
-
-t3 = [(408, 531), (405, 527), (396, 520), (389, 514), (387, 511), (381, 505), (377, 499)]
-shades, alphas, line_widths = repeated_shader(t3, "[i-1.25*i,i-0.5*i]", (0, 20, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.15, line_width=1)
-
-for segment, alpha, line_width in zip(segments, alphas, line_widths):
-    line = Line(segments=segment, div=30, alpha=alpha, line_width=line_width)
-    canvas.add(line)
-
-# Stem
-
-segments = []
-alphas = []
-line_widths = []
-
-
-s1 = [(403, 343), (409, 359), (414, 374), (418, 390), (421, 403), (426, 415), 
-      (429, 429), (433, 449), (437, 461), (441, 474), (444, 488), (450, 503), 
-      (453, 518), (456, 531), (460, 550), (463, 564), (464, 577), (465, 593)]
-shades, alphas, line_widths = repeated_shader(s1, "[i-1.25*i,i-0.5*i]", (0, 10, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.6, line_width=1)
-
-s2 = [(464, 572), (466, 585), (472, 595), (477, 608), (478, 617), (480, 631)]
-shades, alphas, line_widths = repeated_shader(s2, "[i-1.25*i,i-0.5*i]", (0, 10, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.4, line_width=1)
-
-s3  = [(411, 339), (414, 354), (421, 372), (422, 383), (425, 395), (433, 410), 
-        (434, 423), (438, 438), (444, 455), (446, 469), (452, 485), (457, 498), 
-        (461, 513), (465, 525), (469, 544), (472, 555), (474, 565), (476, 579), 
-        (478, 589)]
-shades, alphas, line_widths = repeated_shader(s3, "[i-1.5*i,i-0.5*i]", (0, 30, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.05, line_width=1)
-
-for segment, alpha, line_width in zip(segments, alphas, line_widths):
-    line = Line(segments=segment, div=30, alpha=alpha, line_width=line_width)
-    canvas.add(line)
-
-# Petals
-
-#Left 
-
-segments = []
-alphas = []
-line_widths = []
-
-p1 = [(306, 316), (295, 313), (286, 308), (273, 302), (259, 295), (245, 284), 
-      (236, 276), (226, 263), (216, 252), (208, 240), (203, 229), (198, 221), 
-      (192, 213), (186, 200), (178, 180), (175, 171), (171, 161), (168, 151), (166, 147)]
-shades, alphas, line_widths = repeated_shader(p1, "[i-1.25*i,i-0.5*i]", (0, 7, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.85, line_width=1)
-
-p2 = [(295, 302), (286, 299), (275, 296), (260, 289), (249, 281), (243, 272), 
-      (233, 262), (229, 254)]
-shades, alphas, line_widths = repeated_shader(p2, "[i-1.5*i,i-0.5*i]", (0, 15, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.35, line_width=1)
-
-p3 = [(308, 296), (298, 291), (285, 284), (275, 277), (265, 271), (259, 266), 
-      (251, 257), (245, 250), (235, 242), (227, 231), (220, 220), (214, 208), 
-      (208, 194), (202, 177), (195, 165)]
-shades, alphas, line_widths = repeated_shader(p3, "[i-1.5*i,i-0.5*i]", (0, 2, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.4, line_width=1)
-
-p4 = [(403, 322), (391, 323), (377, 324), (368, 324), (358, 324), (343, 321), 
-      (335, 321), (322, 318)]
-shades, alphas, line_widths = repeated_shader(p4, "[i-0.75*i,i-0.5*i]", (0, 10, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.8, line_width=1)
-
-p5 = [(372, 320), (360, 317), (351, 312), (341, 304), (335, 299)]
-shades, alphas, line_widths = repeated_shader(p5, "[i-0.25*i,i-0.5*i]", (0, 10, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.8, line_width=1)
-
-p6 = [(272, 243), (262, 234), (254, 225), (248, 217), (241, 210), (234, 200), 
-      (229, 191), (222, 184), (218, 173), (212, 160)]
-shades, alphas, line_widths = repeated_shader(p6, "[i-0.25*i,i-0.5*i]", (0, 2, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.25, line_width=1)
-
-p7 = [(343, 300), (335, 292), (327, 285), (320, 280), (314, 276), (302, 264), (294, 253)]
-shades, alphas, line_widths = repeated_shader(p7, "[i-0.25*i,i-0.5*i]", (0, 10, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.4, line_width=1)
-
-p8 = [(286, 235), (280, 226), (272, 215), (263, 201), (259, 188), (255, 179), 
-      (249, 169), (246, 160), (240, 145), (235, 128)]
-shades, alphas, line_widths = repeated_shader(p8, "[i-2.5*i,i-0.5*i]", (0, 5, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=1, line_width=1, random_cond=(-5, 5))
-
-pall = [(397, 327), (390, 327), (379, 327), (370, 327), (355, 327), (341, 326), 
-        (328, 323), (315, 320), (296, 317), (284, 311), (267, 305), (260, 301), 
-        (252, 295), (242, 288), (236, 282), (230, 276), (222, 268), (214, 256), 
-        (208, 246), (202, 239), (197, 226), (188, 212), (181, 197), (178, 183), 
-        (174, 172), (168, 156), (164, 145), (163, 133), (161, 120), (161, 105)]
-shades, alphas, line_widths = repeated_shader(pall, "[i-2*i,i-0.5*i]", (0, 60, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.05, line_width=1)
-
-for segment, alpha, line_width in zip(segments, alphas, line_widths):
-    line = Line(segments=segment, div=30, alpha=alpha, line_width=line_width)
-    canvas.add(line)
-
-# Back Left
-
-segments = []
-alphas = []
-line_widths = []
-
-p1 = [(257, 157), (253, 146), (251, 136), (247, 125), (245, 115), (243, 102), 
-      (240, 91), (238, 80), (237, 76), (236, 69)]
-shades, alphas, line_widths = repeated_shader(p1, "[i-0.25*i,i-0.5*i]", (0, 10, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.3, line_width=1)
-
-p2 = [(232, 113), (230, 106), (229, 98), (228, 95), (226, 89)]
-shades, alphas, line_widths = repeated_shader(p2, "[i+0.25*i,i-0.5*i]", (0, 10, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.3, line_width=1)
-
-p3 = [(259, 137), (254, 125), (251, 115), (249, 105), (247, 97), (245, 89), (243, 83)]
-shades, alphas, line_widths = repeated_shader(p3, "[i-2.5*i,2*i]", (0, 20, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.3, line_width=1)
-
-for segment, alpha, line_width in zip(segments, alphas, line_widths):
-    line = Line(segments=segment, div=30, alpha=alpha, line_width=line_width)
-    canvas.add(line)
-
-# Right
-
-segments = []
-alphas = []
-line_widths = []
-
-p1 = [(489, 255), (489, 243), (489, 230), (484, 215), (480, 203), (478, 194), 
-      (473, 186), (467, 174), (459, 162), (456, 152), (450, 138), (445, 128), 
-      (439, 114), (432, 102), (423, 91), (418, 86), (409, 76)]
-shades, alphas, line_widths = repeated_shader(p1, "[i-1.25*i,2*i]", (0, 40, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.1, line_width=1)
-
-p2 = [(462, 280), (471, 273), (478, 261), (484, 252), (489, 245), (493, 237), 
-      (501, 225), (505, 219), (511, 207)]
-shades, alphas, line_widths = repeated_shader(p2, "[i,i-2*i]", (0, 20, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.4, line_width=1) 
-
-p3 = [(484, 229), (484, 221), (481, 208), (477, 197), (472, 183)]
-shades, alphas, line_widths = repeated_shader(p3, "[i-1.5*i,i]", (0, 40, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.275, line_width=1) 
-
-for segment, alpha, line_width in zip(segments, alphas, line_widths):
-    line = Line(segments=segment, div=30, alpha=alpha, line_width=line_width)
-    canvas.add(line)
-
-# Back Right
-
-segments = []
-alphas = []
-line_widths = []
-
-p1 = [(316, 72), (313, 64), (308, 60), (302, 53), (293, 51)]
-shades, alphas, line_widths = repeated_shader(p1, "[i-2.25*i,0.75*i]", (0, 40, 2), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.3, line_width=1)
-
-p2 = [(387, 61), (390, 51), (390, 41), (390, 30), (386, 20)]
-shades, alphas, line_widths = repeated_shader(p2, "[i-2*i,i-2*i]", (0, 20, 2), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.3, line_width=1)
-
-for segment, alpha, line_width in zip(segments, alphas, line_widths):
-    line = Line(segments=segment, div=30, alpha=alpha, line_width=line_width)
-    canvas.add(line)
-
-# Middle
-
-segments = []
-alphas = []
-line_widths = []
-
-p1 = [(439, 305), (434, 305), (424, 305), (416, 305), (411, 305), (402, 305), 
-      (393, 305), (383, 303), (372, 301), (363, 299), (350, 295), (340, 290)]
-shades, alphas, line_widths = repeated_shader(p1, "[0,0.25*i]", (0, 40, 2), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.3, line_width=1)
-
-p2 = [(381, 285), (366, 281), (353, 275), (339, 268), (328, 259), (315, 246), 
-      (304, 236), (295, 223), (283, 209), (275, 198), (268, 184)]
-shades, alphas, line_widths = repeated_shader(p2, "[i-2*i,0.25*i]", (0, 40, 2), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.2, line_width=1)
-
-p3 = [(344, 221), (332, 211), (324, 197), (315, 180), (307, 163), (300, 152), 
-      (297, 135), (294, 116)]
-shades, alphas, line_widths = repeated_shader(p3, "[i-4*i,0.25*i]", (0, 20, 2), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.2, line_width=1)
-
-p4 = [(426, 264), (425, 245), (422, 221), (417, 204), (413, 175), (408, 155), 
-      (400, 134), (387, 104)]
-shades, alphas, line_widths = repeated_shader(p4, "[i-2*i,0.25*i]", (0, 30, 2), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.3, line_width=1)
-
-for segment, alpha, line_width in zip(segments, alphas, line_widths):
-    line = Line(segments=segment, div=30, alpha=alpha, line_width=line_width)
-    canvas.add(line)
-
-
-# Petal Outline
-
-segments = []
-alphas = []
-line_widths = []
-
-p1 = [(265, 173), (269, 152), (270, 132), (274, 117), (281, 101), (293, 86), (305, 81)]
-shades, alphas, line_widths = repeated_shader(p1, "[i+1*i,0.25*i]", (0, 5, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.6, line_width=1)
-
-p2 = [(443, 139), (433, 128), (428, 121), (421, 110), (414, 97), (407, 90), 
-      (398, 80), (393, 73), (384, 69)]
-shades, alphas, line_widths = repeated_shader(p2, "[i-1*i,0.25*i]", (0, 7, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.6, line_width=1)
-
-p3 = [(416, 76), (416, 66), (419, 52), (422, 40), (428, 30), (432, 22)]
-shades, alphas, line_widths = repeated_shader(p3, "[i-1*i,0.25*i]", (0, 7, 1), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.6, line_width=1)
-
-p4 = [(238, 141), (230, 130), (220, 126), (204, 121), (192, 119), (178, 119), (169, 119)]
-shades, alphas, line_widths = repeated_shader(p4, "[i-1*i,0.25*i]", (0, 21, 3), 
-                                              segments, alphas, line_widths,
-                                              alpha=0.6, line_width=1)
-
-for segment, alpha, line_width in zip(segments, alphas, line_widths):
-    line = Line(segments=segment, div=30, alpha=alpha, line_width=line_width)
-    canvas.add(line)
-
-for obj in canvas.order.items:
-    if isinstance(obj, Line):
-        obj.noise((10,10))
 canvas.show(inspect=True)
\ No newline at end of file
@@ -5,9 +5,10 @@ Minimal Display Elements
 
 from __future__ import annotations
 
-from functools import singledispatchmethod
+from itertools import chain, cycle
+import os
 import time
-from typing import Any, Dict, Iterable, Optional, Type, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type, Tuple, Union
 import warnings
 
 import cairo
@@ -20,6 +21,141 @@ from PIL import Image
 from . import shapes
 from . import objects
 
+# Delay (ms) between checks for inspection clicks on an otherwise idle window
+_INSPECT_DELAY = 30
+
+# pollKey (OpenCV >= 4.5) returns at once, waitKey(1) at least blocks for a
+# window system timer tick
+_poll_key = getattr(cv2, "pollKey", lambda: cv2.waitKey(1))
+
+# Largest share of animated objects, and of the canvas area they repaint,
+# for which Canvas.show redraws only dirty regions instead of everything
+_DIRTY_MAX_SHARE = 0.25
+
+def _named_window(name: str) -> None:
+    """ Creates an OpenGL window when OpenCV is built with OpenGL support """
+
+    try:
+        cv2.namedWindow(name, cv2.WINDOW_OPENGL)
+    except cv2.error:
+        cv2.namedWindow(name)
+
+def _argb32_surface(data: np.ndarray) -> cairo.ImageSurface:
+    """
+    Wraps a height x width x 4 uint8 array as a cairo ARGB32 surface. Rows
+    must match cairo's stride for the width so cairo draws straight into data
+    """
+
+    height, width = data.shape[:2]
+    stride = cairo.ImageSurface.format_stride_for_width(cairo.FORMAT_ARGB32, width)
+    if data.strides[0] != stride:
+        raise ValueError(f"Display rows of {data.strides[0]} bytes do not match "
+                         f"the cairo stride of {stride} bytes")
+    return cairo.ImageSurface.create_for_data(data, cairo.FORMAT_ARGB32,
+                                              width, height, stride)
+
+def _wait_tick(tick: float, delay: float) -> Tuple[float, int]:
+    """
+    Sleeps until delay seconds after tick (time.monotonic) and polls the window
+    for a key press. Returns the new tick and the key, -1 if none was pressed
+    """
+
+    tick = max(tick + delay, time.monotonic())
+    time.sleep(max(0.0, tick - time.monotonic()))
+    return tick, _poll_key()
+
+def _animated(obj: Any) -> bool:
+    """ Whether drawing obj can change it, so it has to be redrawn each tick """
+
+    if isinstance(obj, shapes.CairoMinimalObject):
+        return bool(obj._transforms)
+    if isinstance(obj, objects.Line):
+        return obj._repeat
+    return not isinstance(obj, (objects.Image, objects.LineBuffer))
+
+def _record(obj: Any) -> Tuple[cairo.RecordingSurface, Tuple[float, float, float, float]]:
+    """
+    Draws obj into an unbounded cairo recording. Returns the recording and
+    its ink extents (x, y, width, height), padded by a pixel for antialiasing
+    """
+
+    recording = cairo.RecordingSurface(cairo.CONTENT_COLOR_ALPHA, None)
+    obj._draw(cairo.Context(recording))
+    x, y, width, height = recording.ink_extents()
+    return recording, (x - 1, y - 1, width + 2, height + 2)
+
+def _bounds(rects: Iterable[Tuple[float, ...]]) -> Tuple[float, float, float, float]:
+    """ Bounding (x, y, width, height) rectangle of (x, y, width, height) rectangles """
+
+    rects = np.asarray(list(rects), dtype=float)
+    x0, y0 = rects[:, :2].min(axis=0)
+    x1, y1 = (rects[:, :2] + rects[:, 2:]).max(axis=0)
+    return (x0.item(), y0.item(), (x1 - x0).item(), (y1 - y0).item())
+
+def _overlaps(a: Tuple[float, ...], b: Tuple[float, ...]) -> bool:
+    """ Whether two (x, y, width, height) rectangles intersect """
+
+    return (a[0] < b[0] + b[2] and b[0] < a[0] + a[2]
+            and a[1] < b[1] + b[3] and b[1] < a[1] + a[3])
+
+def open_hdf5(fp: str,
+              mode: Optional[str] = "a",
+              page_size: Optional[int] = None) -> h5py.File:
+    """
+    Open an HDF5 file for Frame.to_hdf5 and Frame.from_hdf5
+
+    Notes:
+        Use as a context manager to write or read many frames through a single
+        open file. With page_size, a new file is created with paged
+        aggregation and opened with a page buffer, which batches small
+        metadata writes into whole pages; this helps on parallel or network
+        file systems, while on local disks it mostly grows the file to whole
+        pages. Page buffering only applies to files created with page_size
+
+    Keyword Arguments:
+        fp (str): Filename or pathlib.Path object for HDF5
+        mode (str, optional): h5py file mode. Default: 'a'
+        page_size (int, optional): File space page size in bytes, the page
+            buffer holds four pages. Default: None (no paging)
+    """
+
+    if page_size is None:
+        return h5py.File(fp, mode)
+
+    if mode in ("w", "w-", "x") or (mode == "a" and not os.path.exists(fp)):
+        # h5py only sets a file space strategy on modes that create the file
+        return h5py.File(fp, "x" if mode == "a" else mode,
+                         fs_strategy="page", fs_page_size=page_size,
+                         page_buf_size=4*page_size)
+    return h5py.File(fp, mode, page_buf_size=4*page_size)
+
+def create_frame_stack(fp: h5py.File,
+                       name: str,
+                       frames: int,
+                       height: int,
+                       width: int,
+                       root: Optional[str] = "/") -> h5py.Dataset:
+    """
+    Preallocate a dataset of frames for Frame.to_hdf5 and Frame.from_hdf5
+    with index
+
+    Notes:
+        The dataset is frames x height x width x 4 uint8 with one
+        uncompressed chunk per frame, so each frame is written as a single
+        chunk, bypassing the chunk cache, and the dataset is never resized
+
+    Keyword Arguments:
+        fp (h5py.File): Open file, see open_hdf5
+        name (str): Name of dataset
+        frames (int): Number of frames in the stack
+        height (int): Frame height
+        width (int): Frame width
+        root (str, optional): Hierarchical root for dataset
+    """
+
+    return fp[root].create_dataset(name, shape=(frames, height, width, 4),
+                                   dtype=np.uint8, chunks=(1, height, width, 4))
+
 class ABDisplay:
 
     """
@@ -53,16 +189,55 @@ class ABDisplay:
         self.color = color
 
         self.inspections = []
+        # ids of the circles marking inspections, removed on right click
+        self._inspection_ids = set()
+        self._dirty = True
+
+        self._bind_data(np.zeros((height, width, 4), dtype=np.uint8))
+        self._clear()
 
-        self.data = np.zeros((height, width, 4), dtype=np.uint8)
+    def _bind_data(self, data: np.ndarray) -> None:
+        """
+        Makes a height x width x 4 uint8 array the pixel data behind surface
+        and canvas. Needed whenever data is replaced rather than written into,
+        as the previous surface keeps drawing into the old array
+        """
 
-        self.surface = cairo.ImageSurface.create_for_data(self.data,
-                                                          cairo.FORMAT_ARGB32,
-                                                          width,
-                                                          height)
+        self.height, self.width = data.shape[:2]
+        self.data = data
+
+        self.surface = _argb32_surface(self.data)
         self.canvas = cairo.Context(self.surface)
-        self.canvas.set_source_rgba(*self.color.get_rgb(), 1.0)
-        self.canvas.paint()
+
+        self._data_u32 = self.data.view(np.uint32).reshape((self.height, self.width))
+
+    @property
+    def color(self) -> Type[Color]:
+        """ Display background color """
+        return self._color
+
+    @color.setter
+    def color(self, value: Type[Color]) -> None:
+        # Opaque background packed as one native-endian ARGB32 pixel, so
+        # clearing the display is a fill instead of a paint through cairo.
+        # Packed here, so the clear picks up a changed color
+        self._color = value
+        self._background = np.uint32(self._argb32(value))
+
+    @staticmethod
+    def _argb32(color: Type[Color]) -> int:
+        """ Packs an opaque Color into a cairo ARGB32 pixel value """
+
+        # Same 8-bit rounding cairo uses for set_source_rgba
+        r, g, b = (int(c * 65535 + 0.5) >> 8 for c in color.get_rgb())
+        return 0xFF000000 | r << 16 | g << 8 | b
+
+    def _clear(self) -> None:
+        """ Resets display data to the background color """
+
+        self.surface.flush()
+        self._data_u32.fill(self._background)
+        self.surface.mark_dirty()
 
     def _inspect(self,
                  event: int,
@@ -81,28 +256,46 @@ class ABDisplay:
                                    metadata={"label": "inspection"})
             self.add(circle)
             self.inspections.append((x, y))
+            self._inspection_ids.add(id(circle))
+            self._dirty = True
 
         elif event == cv2.EVENT_RBUTTONDOWN:
+            # Matched by id, as not every drawing object has metadata
             self.order.items = [obj for obj in self.order.items
-                                if obj.metadata.get("label") != "inspection"]
+                                if id(obj) not in self._inspection_ids]
+            self._inspection_ids.clear()
             self.inspections = []
+            self._dirty = True
+            self._draw_plan = None
             #TODO: Clear inspections from Canvas
 
     def to_image(self, fp: str) -> None:
         """
         Save Display to Image
 
+        Notes:
+            cairo ARGB32 pixels are BGRA in memory on little-endian machines,
+            which is the channel order OpenCV expects, so data is written as
+            is without a color conversion. Formats OpenCV has no writer for
+            (e.g. pdf, ico) are saved by PIL, reading data as raw BGRA
+
         Keyword Arguments:
             fp (str): File path for output image
         """
 
-        img = cv2.cvtColor(self.data, cv2.COLOR_RGB2BGRA)
-        Image.fromarray(img).save(fp)
+        try:
+            written = cv2.imwrite(str(fp), self.data)
+        except cv2.error:
+            Image.frombuffer("RGBA", (self.width, self.height), self.data,
+                             "raw", "BGRA", 0, 1).save(fp)
+            return
+        if not written:
+            raise IOError(f"Could not write image to {fp}")
 
     @property
     def shape(self) -> Tuple[int, int, int]:
-        """ Returns shape of display object """
-        return (self.width, self.height, 4)
+        """ Returns shape of display data, (height, width, 4) as in numpy """
+        return self.data.shape
 
 class Frame(ABDisplay):
     """
@@ -143,20 +336,23 @@ class Frame(ABDisplay):
 
         super().__init__(width=width, height=height, color=color)
 
-    @singledispatchmethod
-    def add(self, obj: Any, _index: Optional[int] = None) -> None:
+    def add(self,
+            obj: Any,
+            _index: Optional[Union[int, Iterable[int]]] = None) -> None:
         """
         Draws drawing objects in frame
 
         Notes:
             Unlike Canvas, Frames are drawn upon addition and not placed in any
             order attribute. Therefore, passing an index to a frame add method
-            will not do anything
+            will not do anything. Lists and tuples of objects are drawn in
+            order
 
         Keyword Arguments:
-            obj (object): Drawing object to add to canvas
-            _index (int, optional): Adds object at particular index in order.
-                Has no use in Frame Object (added from ABDisplay inheritance)
+            obj (object, list, tuple): Drawing object(s) to add to canvas
+            _index (int, Iterable: int, optional): Adds object at particular
+                index in order. Has no use in Frame Object (added from
+                ABDisplay inheritance)
         """
 
         if _index:
@@ -164,26 +360,20 @@ class Frame(ABDisplay):
                           any orderattribute. Therefore, passing an index will
                           not change order in whichdrawing objects are drawn""",
                           SyntaxWarning)
-        obj._draw(self.canvas)
-
-    @add.register(tuple)
-    @add.register(list)
-    def _(self,
-          objs: Union[Tuple, list],
-          indicies: Iterable[int] = None) -> None:
-        """ Iterative add method with lists and tuples """
-
-        if indicies:
-            for obj, index in zip(objs, indicies):
-                self.add(obj, index)
+
+        if isinstance(obj, (list, tuple)):
+            for _obj in obj:
+                _obj._draw(self.canvas)
         else:
-            for obj in objs:
-                self.add(obj)
+            obj._draw(self.canvas)
 
-    def _draw(self, canvas: Type[cairo.Context]) -> None:
-        """ Frame Drawing Method when added to Canvas"""
+    def _draw(self, data: np.ndarray) -> None:
+        """
+        Frame Drawing Method when added to Canvas; copies the frame pixels into
+        the Canvas pixel data, which stays bound to the Canvas surface
+        """
 
-        canvas.data = self.data
+        np.copyto(data, self.data)
 
     def show(self, exit_key: str = "q", inspect: bool = False) -> None:
         """
@@ -196,45 +386,115 @@ class Frame(ABDisplay):
                 inspect and mark points of interests
         """
 
+        _named_window("Frame")
         cv2.imshow("Frame", self.data)
+        self._dirty = False
         if inspect:
             cv2.setMouseCallback("Frame", self._inspect)
 
-        while True:
-            cv2.imshow("Frame", self.data)
-            if cv2.waitKey(0) & 0xFF == ord(exit_key):
-                break
+        # A static frame is only shown again after an inspection click drew
+        # on it; without inspect, block until a key is pressed
+        delay = _INSPECT_DELAY if inspect else 0
+        while cv2.waitKey(delay) & 0xFF != ord(exit_key):
+            if self._dirty:
+                cv2.imshow("Frame", self.data)
+                self._dirty = False
 
         cv2.destroyAllWindows()
 
-    def to_hdf5(self, fp: str, name: str, root: Optional[str] = "/") -> None:
+    def to_hdf5(self,
+                fp: Union[str, h5py.File],
+                name: str,
+                root: Optional[str] = "/",
+                chunks: Optional[Tuple[int, int, int]] = None,
+                compression: Optional[str] = "gzip",
+                compression_opts: Optional[int] = 1,
+                shuffle: Optional[bool] = True,
+                index: Optional[int] = None) -> None:
         """
         Save Frame to HDF5
 
         Notes:
-            If HDF5 at 'fp' already exists, will append on to it
+            If HDF5 at 'fp' already exists, will append on to it. When saving
+            many frames, pass a file opened once with open_hdf5 instead of a
+            path, so the file is not reopened for every frame. With index,
+            the frame is written into an existing stack made by
+            create_frame_stack, and chunks and compression are unused
 
         Keyword Arguments:
-            fp (str): Filename or pathlib.Path object for Image
+            fp (str, h5py.File): Filename, pathlib.Path object or open file
+                for HDF5
             name (str): Name of dataset to save Frame to
             root (str, optional): Hierarchical root for dataset
+            chunks (tuple: int, optional): Chunk shape of dataset.
+                Default: 64 x 64 pixel tiles
+            compression (str, optional): h5py compression filter, None to
+                store raw pixels. Default: 'gzip'
+            compression_opts (int, optional): Compression level. Default: 1
+            shuffle (bool, optional): Byte shuffle pixels before compression.
+                Default: True
+            index (int, optional): Position of the frame in a frame stack.
+                Default: None (save as its own dataset)
         """
 
-        with h5py.File(fp, 'a') as f:
-            f[root].create_dataset(name, data=self.data)
-
-    def from_hdf5(self, fp: str, name: str, root: Optional[str] = "/") -> None:
+        if index is not None:
+            if not isinstance(fp, h5py.File):
+                with open_hdf5(fp) as f:
+                    self.to_hdf5(f, name, root, index=index)
+                return
+            dataset = fp[f"{root}/{name}"]
+            if dataset.shape[1:] != self.data.shape:
+                raise ValueError(f"Frame of shape {self.data.shape} does not match "
+                                 f"frame stack of shape {dataset.shape}")
+            self.surface.flush()
+            dataset.id.write_direct_chunk((index, 0, 0, 0), self.data)
+            return
+
+        if chunks is None:
+            chunks = (min(self.height, 64), min(self.width, 64), 4)
+
+        if not isinstance(fp, h5py.File):
+            with open_hdf5(fp) as f:
+                self.to_hdf5(f, name, root, chunks, compression, compression_opts, shuffle)
+            return
+
+        fp[root].create_dataset(name, data=self.data,
+                                chunks=chunks,
+                                compression=compression,
+                                compression_opts=compression_opts if compression else None,
+                                shuffle=shuffle)
+
+    def from_hdf5(self,
+                  fp: Union[str, h5py.File],
+                  name: str,
+                  root: Optional[str] = "/",
+                  index: Optional[int] = None) -> None:
         """
         Load Frame from HDF5
 
         Keyword Arguments:
-            fp (str): Filename or pathlib.Path object for Image
+            fp (str, h5py.File): Filename, pathlib.Path object or open file
+                for HDF5
             name (str): Name of dataset to save Frame to
             root (str, optional): Hierarchical root for dataset
+            index (int, optional): Position of the frame in a frame stack made
+                by create_frame_stack. Default: None
         """
 
-        with h5py.File(fp, 'r') as f:
-            self.data = f[f"{root}/{name}"][:]
+        if not isinstance(fp, h5py.File):
+            with h5py.File(fp, 'r') as f:
+                self.from_hdf5(f, name, root, index)
+            return
+
+        # Read into the array cairo draws on; a frame of another size gets a
+        # new array bound to a new surface
+        dataset = fp[f"{root}/{name}"]
+        shape = dataset.shape if index is None else dataset.shape[1:]
+        if shape != self.data.shape:
+            self._bind_data(np.empty(shape, dtype=np.uint8))
+        self.surface.flush()
+        dataset.read_direct(self.data, None if index is None else np.s_[index])
+        self.surface.mark_dirty()
 
 class Canvas(ABDisplay):
 
@@ -257,6 +517,11 @@ class Canvas(ABDisplay):
         canvas (cairo.Context): Cairo context object for drawing instructions
         fps (int): Frames per second for Frame or Drawing Objects when displayed
             in Canvas
+        lines (list): Line objects added to the canvas, collected as they are
+            added so they can be processed as a batch (e.g. with
+            objects.noise_lines) without filtering the order
+        double_buffer (bool): Draw non-framed objects off-screen and copy the
+            finished frame into data
 
     Keyword Arguments:
         width (float): Display Width
@@ -265,6 +530,10 @@ class Canvas(ABDisplay):
             Default: Color(rgb=(1,1,1))
         fps (int): Frames per second for Frame or Drawing Objects when displayed
             in Canvas. Default: 60
+        double_buffer (bool, optional): Render each frame into an off-screen
+            surface so data never holds a partially drawn frame, e.g. when
+            data is read from another thread while drawing. Costs one extra
+            copy per frame. Default: False
 
     Examples:
         >>> Canvas = minimal.display.Canvas(800, 800)
@@ -278,13 +547,43 @@ class Canvas(ABDisplay):
                  width: float,
                  height: float,
                  color: Optional[Type[Color]] = Color(rgb=(1,1,1)),
-                 fps: Optional[int] = 60) -> None:
+                 fps: Optional[int] = 60,
+                 double_buffer: Optional[bool] = False) -> None:
 
         super().__init__(width=width, height=height, color=color)
 
         self.fps = fps
         self.refresh = True
         self.order = Order()
+        self.lines = []
+        # (draw method, target) of each object in order and the order version
+        # it was built for, see _draw_nonframed
+        self._draw_plan = None
+        self._draw_plan_version = None
+        # [object, animated, recording, extents] of each object and the order
+        # version they were recorded for, see _draw_dirty
+        self._recordings = None
+        self._recordings_version = None
+
+        self.double_buffer = double_buffer
+
+    @property
+    def double_buffer(self) -> bool:
+        """ Whether non-framed objects are drawn off-screen, see _draw_nonframed """
+        return self._back_data is not None
+
+    @double_buffer.setter
+    def double_buffer(self, value: bool) -> None:
+        # Back buffers are allocated when enabled and dropped when disabled,
+        # so double buffering can be toggled after construction
+        if value and getattr(self, "_back_data", None) is None:
+            self._back_data = np.empty_like(self.data)
+            self._back_surface = _argb32_surface(self._back_data)
+            self._back_canvas = cairo.Context(self._back_surface)
+        elif not value:
+            self._back_data = self._back_surface = self._back_canvas = None
+        # The draw plan holds the front or back buffer as draw targets
+        self._draw_plan = None
 
     @property
     def _framerate(self) -> int:
@@ -292,7 +591,7 @@ class Canvas(ABDisplay):
         For drawing Frames on Canvas, we define frame rate to be the
         millisecond delay between frame displays. Use of @property on _framerate
         to allow users to adjust fps without needing to calculate millisecond
-        delay for cv2.waitKey
+        delay between Canvas.show ticks
         """
         return int((1 / self.fps) * 1000)
 
@@ -300,44 +599,85 @@ class Canvas(ABDisplay):
     def _framerate(self, value: int) -> None:
         self._fps = value
 
-    @singledispatchmethod
-    def add(self, obj: Any, index: Optional[int] = None) -> None:
+    def add(self,
+            obj: Any,
+            index: Optional[Union[int, Iterable[int]]] = None) -> None:
         """
         Handles inserting drawing objects into display order
 
         Notes:
-            Single object entry handled in base add method, lists and tuples
-            are handled in an iterative manner managed by singledispatchmethod
-            register
+            Lists and tuples of objects are added in one batch, or at each of
+            the indices in index when given
 
         Keyword Arguments:
-            obj (object): Drawing object to add to canvas
-            index (int, optional): Adds object at particular index in order.
+            obj (object, list, tuple): Drawing object(s) to add to canvas
+            index (int, Iterable: int, optional): Adds object at particular
+                index in order, or objects at their respective indices.
                 Default: None
         """
 
+        if isinstance(obj, (list, tuple)):
+            if index:
+                for _obj, _index in zip(obj, index):
+                    self.add(_obj, _index)
+                return
+            if any(isinstance(_obj, Frame) for _obj in obj):
+                self.refresh = False
+            self.lines.extend(_obj for _obj in obj if isinstance(_obj, objects.Line))
+            self.order.extend(obj)
+            self._dirty = True
+            self._draw_plan = None
+            return
+
         if isinstance(obj, Frame):
             self.refresh = False
+        elif isinstance(obj, objects.Line):
+            self.lines.append(obj)
+        self._dirty = True
+        self._draw_plan = None
 
         if isinstance(index, int):
             self.order.insert(index, obj)
         else:
             self.order.append(obj)
 
-    @add.register(tuple)
-    @add.register(list)
-    def _(self,
-          objs: Union [Tuple, list],
-          indicies: Iterable[int] = None) -> None:
-        """ Iterative add method with lists and tuples """
+    def add_lines(self,
+                  segments: np.ndarray,
+                  alphas: Union[float, Iterable[float]] = 1.0,
+                  line_widths: Union[float, Iterable[float]] = 2,
+                  div: int = 2,
+                  **kwargs: Any) -> list:
+        """
+        Adds many Lines from an array of segment points in one batch
+
+        Notes:
+            Points of every line are densified in a single pass (see
+            objects.Line.from_arrays) and the lines are appended to the
+            display order at once. The added Line objects are returned
 
-        if indicies:
-            for obj, index in zip(objs, indicies):
-                self.add(obj, index)
-        else:
-            for obj in objs:
-                self.add(obj)
+        Keyword Arguments:
+            segments (np.ndarray): k x n x 2 array of x, y points, one row
+                per line
+            alphas (float, Iterable): Alpha transparency of each line, or one
+                alpha for all lines. Default: 1.0
+            line_widths (float, Iterable): Line width of each line, or one
+                width for all lines. Default: 2
+            div (int): Divisions of each line. Default: 2
+            ** kwargs as defined by objects.Line.from_arrays
+        """
 
+        lines = objects.Line.from_arrays(segments, div=div, **kwargs)
+        alphas = np.broadcast_to(alphas, len(lines))
+        line_widths = np.broadcast_to(line_widths, len(lines))
+        for line, alpha, line_width in zip(lines, alphas.tolist(), line_widths.tolist()):
+            line.alphas = [alpha]
+            line.line_width = line_width
+
+        self.order.extend(lines)
+        self.lines.extend(lines)
+        self._dirty = True
+        self._draw_plan = None
+        return lines
 
     def _draw_nonframed(self) -> None:
         """
@@ -346,15 +686,106 @@ class Canvas(ABDisplay):
         _TRANSFORMABLE_VARIABLES or other mutable properties
         """
 
-        if self.refresh:
-            self.canvas.set_source_rgba(*self.color.get_rgb(), 1.0)
-            self.canvas.paint()
-        for obj in self.order:
-            if isinstance(obj, (objects.Image, objects.Video)):
-                #TODO: Will have to rework these methods
-                obj._draw(self.data)
+        if self.double_buffer:
+            # Back buffer starts from the background, or from the shown frame
+            # when frames are kept between draws
+            self._back_surface.flush()
+            if self.refresh:
+                self._back_data.view(np.uint32).fill(self._background)
             else:
-                obj._draw(self.canvas)
+                np.copyto(self._back_data, self.data)
+            self._back_surface.mark_dirty()
+            canvas, data = self._back_canvas, self._back_data
+        else:
+            if self.refresh:
+                self._clear()
+            canvas, data = self.canvas, self.data
+
+        # Draw targets are resolved once per change of order rather than with
+        # an isinstance per object on every frame; the version check catches
+        # items changed in order directly
+        if self._draw_plan is None or self._draw_plan_version != self.order.version:
+            self._draw_plan_version = self.order.version
+            #TODO: Will have to rework Image and Video draw methods
+            self._draw_plan = [(obj._draw, data if isinstance(obj, (Frame, objects.Image, objects.Video))
+                                else canvas) for obj in self.order]
+        for draw, target in self._draw_plan:
+            draw(target)
+
+        if self.double_buffer:
+            self._back_surface.flush()
+            self.surface.flush()
+            np.copyto(self.data, self._back_data)
+            self.surface.mark_dirty()
+
+    def _draw_dirty(self) -> None:
+        """
+        Redraws only the parts of data changed since the last call, used by
+        show for scenes of cairo-drawn objects
+
+        Notes:
+            Objects are recorded into cairo recording surfaces, whose ink
+            extents bound what they draw. Static objects keep their recording,
+            animated ones are re-recorded on each call; the previous and new
+            extents of animated objects are then merged into one region,
+            cleared to the background and repainted, replaying only the
+            recordings that overlap it. When the region covers more than
+            _DIRTY_MAX_SHARE of the canvas, all recordings are replayed.
+            Objects are recorded again whenever _recordings is reset to None.
+            Frames, Images and Videos draw straight into data, outside of any
+            cairo clip, so scenes with them are redrawn in full. Each object
+            draws into a context of its own, so cairo state set by one object
+            is not seen by the next; show only uses this method when few
+            objects are animated
+        """
+
+        if any(isinstance(obj, (Frame, objects.Image, objects.Video))
+               for obj in self.order.items):
+            self._draw_nonframed()
+            return
+
+        canvas = self.canvas
+        if self._recordings is None or self._recordings_version != self.order.version:
+            self._recordings_version = self.order.version
+            self._recordings = [[obj, _animated(obj), *_record(obj)]
+                                for obj in self.order.items]
+            self._clear()
+            for _, _, recording, _ in self._recordings:
+                canvas.set_source_surface(recording, 0, 0)
+                canvas.paint()
+            return
+
+        regions = []
+        for entry in self._recordings:
+            if entry[1]:
+                regions.append(entry[3])
+                entry[2], entry[3] = _record(entry[0])
+                regions.append(entry[3])
+        if not regions:
+            return
+
+        # Previous and new extents are merged into one region, so the
+        # overlap test is a single check per recording
+        region = _bounds(regions)
+        height, width = self.data.shape[:2]
+        if region[2] * region[3] > _DIRTY_MAX_SHARE * width * height:
+            # Most of the canvas changed, replay everything without clipping
+            self._clear()
+            for _, _, recording, _ in self._recordings:
+                canvas.set_source_surface(recording, 0, 0)
+                canvas.paint()
+            return
+
+        canvas.save()
+        canvas.rectangle(*region)
+        canvas.clip()
+        canvas.set_source_rgb(*self.color.get_rgb())
+        canvas.paint()
+        for _, _, recording, extents in self._recordings:
+            if _overlaps(extents, region):
+                canvas.set_source_surface(recording, 0, 0)
+                canvas.paint()
+        canvas.restore()
 
     def show(self,
              exit_key: str = "q",
@@ -382,8 +813,7 @@ class Canvas(ABDisplay):
                 the Canvas object
         """
 
-        run = True
-
+        _named_window("Canvas")
         cv2.imshow("Canvas", self.data)
         if inspect:
             cv2.setMouseCallback("Canvas", self._inspect)
@@ -392,22 +822,52 @@ class Canvas(ABDisplay):
                 and self.order.items):
 
             self.order.stopiter = False
-            while run:
-                frame = next(self.order)
-                frame._draw(self)
-                cv2.imshow("Canvas", self.data)
-                if cv2.waitKey(self._framerate) & 0xFF == ord(exit_key):
-                    run = False
+            # Per-tick invariants are looked up once, outside the loops. Ticks
+            # are paced by time.monotonic rather than by waitKey timeouts
+            imshow = cv2.imshow
+            delay, exit_ord = self._framerate / 1000, ord(exit_key)
+
+            shown = 0
+            tick = time.monotonic()
+            for frame in self.order:
+                frame._draw(self.data)
+                shown += 1
+                imshow("Canvas", self.data)
+                tick, key = _wait_tick(tick, delay)
+                if key & 0xFF == exit_ord:
+                    break
             self.order.stopiter = True
             if restart_frames:
                 self.order.i = 0
+            else:
+                self.order.i = (self.order.i + shown) % len(self.order.items)
 
         else:
-            while run:
-                self._draw_nonframed()
-                cv2.imshow("Canvas", self.data)
-                if cv2.waitKey(self._framerate) & 0xFF == ord(exit_key):
-                    run = False
+            imshow = cv2.imshow
+            delay, exit_ord = self._framerate / 1000, ord(exit_key)
+            # Only regions touched by animated objects are repainted when
+            # each tick starts from a cleared background and few objects move
+            dirty_regions = self.refresh and not self.double_buffer
+
+            # Scenes without animated objects are only redrawn when the order
+            # changes (e.g. by inspection clicks), not on every tick
+            self._dirty = True
+            tick = time.monotonic()
+            while True:
+                if self._dirty:
+                    flags = [_animated(obj) for obj in self.order.items]
+                    animated = any(flags)
+                    self._recordings = None
+                    draw = (self._draw_dirty if dirty_regions
+                            and sum(flags) <= _DIRTY_MAX_SHARE * len(flags)
+                            else self._draw_nonframed)
+                if self._dirty or animated:
+                    draw()
+                    imshow("Canvas", self.data)
+                    self._dirty = False
+                tick, key = _wait_tick(tick, delay)
+                if key & 0xFF == exit_ord:
+                    break
 
         cv2.destroyAllWindows()
 
@@ -440,23 +900,55 @@ class Canvas(ABDisplay):
         compatible across different environments?
         """
 
+        # VideoWriter takes (width, height) and silently skips frames of any
+        # other size
         _fourcc = cv2.VideoWriter_fourcc(*fourcc)
         video = cv2.VideoWriter(fp, _fourcc,
                                 self.fps,
-                                (self.shape[0], self.shape[1]))
+                                (int(self.width), int(self.height)))
+
+        # One BGR buffer reused for the conversion of every written frame
+        bgr = np.empty((*self.data.shape[:2], 3), dtype=np.uint8)
 
         if all(isinstance(frame, Frame) for frame in self.order):
             for frame in self.order:
-                frame._draw(self)
-                video.write(cv2.cvtColor(self.data, cv2.COLOR_RGBA2BGR))
+                if frame.data.shape != self.data.shape:
+                    video.release()
+                    raise ValueError(f"Frame of shape {frame.data.shape} does not match "
+                                     f"Canvas shape {self.data.shape}")
+                frame._draw(self.data)
+                video.write(cv2.cvtColor(self.data, cv2.COLOR_BGRA2BGR, dst=bgr))
         else:
             end = time.time() + duration
             while time.time() < end:
                 self._draw_nonframed()
-                video.write(cv2.cvtColor(self.data, cv2.COLOR_RGBA2RGB))
+                video.write(cv2.cvtColor(self.data, cv2.COLOR_BGRA2BGR, dst=bgr))
 
         video.release()
 
+class _Items(list):
+
+    """
+    Order items list counting its changes in version, so cached per-item
+    state (e.g. Canvas._draw_plan) can tell when items were changed in place
+    """
+
+    version = 0
+
+def _counted(name: str):
+    """ list method name wrapped to bump _Items.version before running """
+
+    method = getattr(list, name)
+    def counted(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+    counted.__name__ = name
+    return counted
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__", "append",
+              "extend", "insert", "pop", "remove", "clear", "sort", "reverse"):
+    setattr(_Items, _name, _counted(_name))
+
 class Order:
 
     """
@@ -470,18 +962,36 @@ class Order:
 
     Attributes:
         items (list): Items added through either Canvas.add or Frame.add
-        i (int): Beginning index of items
-        j (int): Ending index of items
+        i (int): Index of items that infinite iteration starts from
+        version (int): Number of changes made to items, in place or by
+            replacing it
         stopiter (bool): Toggle iteration through order. If True, will
-            stop the iteration once it reaches j. If False, will repeat from i.
+            stop the iteration once it reaches the last item. If False, will
+            repeat from the first item indefinitely
     """
 
     def __init__(self) -> None:
 
-        self.items = []
-        self.i, self.j = 0, len(self.items)
+        self._items = _Items()
+        self.i = 0
         self.stopiter = True
 
+    @property
+    def items(self) -> List[Any]:
+        """ Drawing objects in order, changes to it are counted in version """
+        return self._items
+
+    @items.setter
+    def items(self, items: Iterable[Any]) -> None:
+        version = self._items.version + 1
+        self._items = _Items(items)
+        self._items.version = version
+
+    @property
+    def version(self) -> int:
+        """ Number of changes made to items, including replacing it """
+        return self._items.version
+
     def append(self, obj: Any) -> None:
         """
         Append Objects into Order items
@@ -491,7 +1001,16 @@ class Order:
         """
 
         self.items.append(obj)
-        self.j = len(self.items)
+
+    def extend(self, objs: Iterable[Any]) -> None:
+        """
+        Append many Objects into Order items at once
+
+        Keyword Arguments:
+            objs (Iterable): Drawing Objects to append to order
+        """
+
+        self.items.extend(objs)
 
     def insert(self, index: int, obj: object) -> None:
         """
@@ -503,22 +1022,10 @@ class Order:
         """
 
         self.items.insert(index, obj)
-        self.j = len(self.items)
-
-    def __next__(self) -> Any:
-
-        if self.i < self.j:
-            pass
-        else:
-            if not self.stopiter:
-                self.i = 0
-            else:
-                self.i = 0
-                raise StopIteration
-
-        obj = self.items[self.i]
-        self.i += 1
-        return obj
 
-    def __iter__(self) -> Order:
-        return self
+    def __iter__(self) -> Iterator[Any]:
+        # Plain list iteration (or itertools.cycle) runs in C, with no
+        # cursor bookkeeping per item
+        if self.stopiter:
+            return iter(self.items)
+        return chain(self.items[self.i:], cycle(self.items))
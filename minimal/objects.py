@@ -4,6 +4,8 @@ Minimal Objects
 """
 
 from datetime import datetime
+import queue
+import threading
 
 import cairo
 from colour import Color
@@ -11,6 +13,11 @@ import cv2
 import imageio
 import numpy as np
 
+try:
+    from numba import njit, prange
+except ImportError: # Falls back to SimplexNoise.noise3_array and OpenCV blending
+    njit = None
+
 from . import noise
 
 #TODO: Can we do 3d rotations via cv2.warpPerspective
@@ -25,7 +32,9 @@ class Line():
                  csystem="cartesian",
                  offset=(0, 0),
                  line_width=2,
-                 dimension=2
+                 dimension=2,
+                 xs=None,
+                 ys=None
                  ):
         """ 
         Minimal Generative Line
@@ -50,6 +59,8 @@ class Line():
             offset (tuple, int): x, y offset of center, useful in polar coordinate system
             line_width (float): Line Width
             dimension (float): Specify whether object is plotted in 2d or 3d
+            xs (ndarray): x coordinates of segment points, used with ys in place of segments
+            ys (ndarray): y coordinates of segment points, used with xs in place of segments
         
         """
         
@@ -66,22 +77,132 @@ class Line():
         
         self.line_width = line_width
         
-        if start and stop:
+        if start is not None and stop is not None:
             self.start = start
             self.stop = stop
-            self.pts = np.array((np.linspace(start[0], stop[0], div),
-                                np.linspace(start[1], stop[1], div))).T
-        elif segments:
+            self.pts = np.linspace(start, stop, div, dtype=float)
+        elif segments is not None and len(segments):
+            self.start, self.stop = segments[0], segments[1]
+            self.pts = _segment_pts(np.asarray(segments, dtype=float), div)
+        elif xs is not None and ys is not None and len(xs):
+            segments = np.empty((len(xs), 2), dtype=np.result_type(xs, ys, np.float32))
+            segments[:, 0], segments[:, 1] = xs, ys
             self.start, self.stop = segments[0], segments[1]
-            self.pts = np.empty((0, 2))
-            for seg1, seg2 in zip(segments[:], segments[1:]):
-                self.pts = np.vstack((self.pts, np.array((np.linspace(seg1[0], seg2[0], div//(len(segments)-1)),
-                                                          np.linspace(seg1[1], seg2[1], div//(len(segments)-1)))).T))
+            self.pts = _segment_pts(segments, div)
                 
         self._repeat = False
         self._lead = div
         self._follow = 0
 
+    @property
+    def colors(self):
+        """ Colors of the line color ranges """
+        return self._colors
+
+    @colors.setter
+    def colors(self, colors):
+        self._colors = colors
+        self._rgba = None
+
+    @property
+    def alphas(self):
+        """ Alphas of the line color ranges """
+        return self._alphas
+
+    @alphas.setter
+    def alphas(self, alphas):
+        self._alphas = alphas
+        self._rgba = None
+
+    @property
+    def rgba(self):
+        """
+        n x 4 array of the r, g, b, alpha of each color range. Built from
+        colors and alphas on first access after either is replaced
+        """
+        if self._rgba is None:
+            self._rgba = np.array([(*color.get_rgb(), alpha)
+                                   for color, alpha in zip(self._colors, self._alphas)],
+                                  dtype=float).reshape((-1, 4))
+        return self._rgba
+
+    @property
+    def pts(self):
+        """
+        div x 2 line points. Points coupled from other lines are kept as
+        separate chunks and joined once, on first access after coupling
+        """
+        if len(self._pts_chunks) > 1:
+            self._pts_chunks = [np.concatenate(self._pts_chunks)]
+        return self._pts_chunks[0]
+
+    @pts.setter
+    def pts(self, pts):
+        self._pts_chunks = [pts]
+
+    @property
+    def xs(self):
+        """ x coordinates of the line points (view into pts) """
+        return self.pts[..., 0]
+
+    @property
+    def ys(self):
+        """ y coordinates of the line points (view into pts) """
+        return self.pts[..., 1]
+
+    @classmethod
+    def from_array(cls, segments, div=2, **kwargs):
+        """
+        Line from an n x 2 array of segment points
+
+        Notes:
+            Same as Line(segments=segments, ...) but segments must already be
+            a float ndarray, which is used as is without conversion
+
+        Keyword Arguments:
+            segments (ndarray): n x 2 array of x, y points
+            div (int): Divisions of the line. Default is set to 2
+            ** kwargs as defined by Line
+        """
+
+        line = cls(div=div, **kwargs)
+        line.start, line.stop = segments[0], segments[1]
+        line.pts = _segment_pts(segments, div)
+        return line
+
+    @classmethod
+    def from_arrays(cls, segments, div=2, noise_scale=0, z=datetime.now().microsecond, **kwargs):
+        """
+        Lines from a k x n x 2 array of segment points
+
+        Notes:
+            Points of all k lines are densified in a single pass, then
+            handed to each Line; see Line.from_array. A nonzero noise_scale
+            displaces the densified points as Line.noise would before they
+            are split, saving a second pass over every line
+
+        Keyword Arguments:
+            segments (ndarray): k x n x 2 array of x, y points
+            div (int): Divisions of each line. Default is set to 2
+            noise_scale (int, float, tuple): Scale of noise added to every
+                line, see Line.noise. Default is set to 0 (no noise)
+            z (int, float): Variable parameter to ensure random generation of noise in each run
+            ** kwargs as defined by Line
+        """
+
+        all_pts = _segment_pts(segments, div)
+        scalex, scaley = _noise_scale(noise_scale)
+        if scalex != 0 or scaley != 0:
+            _add_noise(all_pts.reshape((-1, 2)), div, scalex, scaley, z)
+
+        lines = []
+        for segment, pts in zip(segments, all_pts):
+            line = cls(div=div, **kwargs)
+            line.start, line.stop = segment[0], segment[1]
+            line.pts = pts
+            lines.append(line)
+        return lines
+
     def ranges(self, colorrange):
         """ 
         Get different colors across ranges of divs in line
@@ -103,23 +224,11 @@ class Line():
         """ Generative Object Drawing Method """
         
         canvas.set_line_width(self.line_width)
-        
-        for colorrange, color in zip(self.colorranges, zip(self.colors, self.alphas)):
-            follow, lead = self.ranges(colorrange)
-            if not follow and not lead:
-                continue
-            for i, f in zip(self.pts[follow:lead], self.pts[follow+1:lead]):
-                canvas.set_source_rgba(*color[0].get_rgb(), color[1])
-                if self.csystem == "cartesian":
-                    #TODO: Some gap between lines thats visible, how can we connect this so it doesnt look disjointed?
-                    # See https://stackoverflow.com/questions/38143037/cairo-gtk-draw-a-line-with-transparency-like-a-highlighter-pen
-                    canvas.move_to(i[0], i[1])
-                    canvas.line_to(f[0], f[1])
-                elif self.csystem== "polar":
-                    canvas.move_to(i[0]*np.cos(i[1])+self.offset[0], i[0]*np.sin(i[1])+self.offset[1])
-                    canvas.line_to(f[0]*np.cos(f[1])+self.offset[0], f[0]*np.sin(f[1])+self.offset[1])
-                canvas.stroke()
         canvas.set_line_join(cairo.LINE_JOIN_ROUND)
+        rgba = self.rgba.tolist()
+        # Lines hold (div, 2) points, LineBatch holds (n, div, 2)
+        for pts in self.pts.reshape((-1, *self.pts.shape[-2:])):
+            self._draw_pts(canvas, pts, rgba)
             
         if self._repeat:
             if self._lead < self.div:
@@ -128,6 +237,33 @@ class Line():
                 self._follow += 1
             elif self._follow == self._lead:
                 self._follow, self._lead = 0, 0
+
+    def _draw_pts(self, canvas, pts, rgba):
+        """ Draws a single set of line points with the line color ranges """
+
+        if self.csystem == "polar":
+            r, theta = pts[:, 0], pts[:, 1]
+            pts = np.stack((r*np.cos(theta) + self.offset[0],
+                            r*np.sin(theta) + self.offset[1]), axis=-1)
+
+        # Points are converted to floats once and the cairo method looked up
+        # once, so each vertex costs a single call into cairo
+        pts = pts.tolist()
+        line_to = canvas.line_to
+        for colorrange, color in zip(self.colorranges, rgba):
+            follow, lead = self.ranges(colorrange)
+            if not follow and not lead:
+                continue
+            path = pts[follow:lead]
+            if len(path) < 2:
+                continue
+            # One path per color range, so segments meet at round joins
+            # instead of overlapping (visible with alpha) at every point
+            canvas.set_source_rgba(*color)
+            canvas.move_to(*path[0])
+            for x, y in path[1:]:
+                line_to(x, y)
+            canvas.stroke()
     
     def shape(self, f, axis="x"):
         """ 
@@ -174,6 +310,7 @@ class Line():
             self.colorranges.append(tuple([int(i) for i in p]))
             self.colors.append(c[0])
             self.alphas.append(c[1])
+        self._rgba = None
         
     def repeat(self, random=False):
         """ 
@@ -206,9 +343,15 @@ class Line():
         
         self.colorranges.append((self.colorranges[-1][-1], self.colorranges[-1][-1] + line.div))
         self.colors.append(line.colors[0]) # TOOO: This doesnt seem like the best thing to do
+        self._rgba = None
         
         self._lead += line.div
-        self.pts = np.vstack((self.pts[:-1], line.pts[:]))
+        # Copied before trimming, so the lines stay independent and a line
+        # coupled with itself keeps all of its points
+        pts = line.pts.copy()
+        # The last point of this line is replaced by the start of the coupled one
+        self._pts_chunks[-1] = self._pts_chunks[-1][:-1]
+        self._pts_chunks.append(pts)
 
     def noise(self, scale=1, z=datetime.now().microsecond, **kwargs):
         """
@@ -224,25 +367,343 @@ class Line():
         
         """
 
-        snoise = noise.SimplexNoise()
+        scalex, scaley = _noise_scale(scale)
+        if scalex == 0 and scaley == 0:
+            return
 
-        if isinstance(scale, int) or isinstance(scale, float):
-            scalex, scaley = scale, scale
-        elif isinstance(scale, tuple):
-            scalex, scaley = scale[0], scale[1]
-        else:
-            raise NotImplementedError("Noise scale only accepts int for uniform axis definition or tuple with length 2 for singular axis definition")
-
-        for pt in range(len(self.pts)):
-            self.pts[pt, 0] += scalex*snoise.noise3(x=self.pts[pt, 0]/self.div, 
-                                                    y=self.pts[pt, 1]/self.div,
-                                                    z=z)
-            self.pts[pt, 1] += scaley*snoise.noise3(x=self.pts[pt, 0]/self.div, 
-                                                    y=self.pts[pt, 1]/self.div,
-                                                    z=z)
+        _add_noise(self.pts, self.div, scalex, scaley, z)
     
     #TODO: Bezier Curve in Line: https://stackoverflow.com/questions/12643079/b%C3%A9zier-curve-fitting-with-scipy
 
+class LineBatch(Line):
+
+    def __init__(self, pairs, div=2, color=Color(rgb=(0, 0, 0)),
+                 alpha=1.0, line_width=2, displacement=None):
+        """
+        Minimal Generative Line Batch
+
+        Notes:
+            - Many straight lines sharing divisions, colors, and line width
+            stored as one (n, div, 2) array of points. Construction and noise
+            are vectorized over every line at once instead of one Line object
+            per pair of endpoints.
+            - Color methods (gradient, repeat) apply to every line in the batch
+
+        Keyword Arguments:
+            pairs (Iterable): n x 2 x 2 container of start, stop x, y coordinates
+            div (int): Divisions of each line. Default is set to 2
+            color (colour.Color): Color of Lines
+            alpha (float): Alpha transparency of Lines
+            line_width (float): Line Width
+            displacement (ndarray, optional): n x div x 2 offsets added to the
+                line points, e.g. a scaled noise_field reused across frames
+        """
+
+        super().__init__(div=div, color=color, alpha=alpha,
+                         line_width=line_width)
+
+        pairs = np.asarray(pairs, dtype=float).reshape((-1, 2, 2))
+        self.start, self.stop = pairs[:, 0], pairs[:, 1]
+
+        t = np.linspace(0, 1, div)
+        self.pts = (self.start[:, np.newaxis, :]
+                    + t[np.newaxis, :, np.newaxis] * (self.stop - self.start)[:, np.newaxis, :])
+        if displacement is not None:
+            self.pts += displacement
+
+    def noise(self, scale=1, z=datetime.now().microsecond, **kwargs):
+        """
+        Using simplex noise to add noise to every line in the batch
+
+        Keyword Arguments:
+            scale (int, float, tuple): Define scaling factors to induced noise. If int or float is provided
+                                       will apply to axis 0, 1. If tuple is provided, will apply index 0, 1
+                                       to axis 0, 1
+            z (int, float): Variable parameter to ensure random generation of noise in each run
+        """
+
+        scalex, scaley = _noise_scale(scale)
+        if scalex == 0 and scaley == 0:
+            return
+
+        pts = self.pts.reshape((-1, 2))
+        _add_noise(pts, self.div, scalex, scaley, z)
+        self.pts = pts.reshape(self.pts.shape)
+
+    def noise_field(self, z=datetime.now().microsecond):
+        """
+        Sample unit scale simplex noise displacements for the batch points
+
+        Notes:
+            Both axes are sampled at the undisplaced points, so the field is
+            linear in its scale and, for animations where only the noise scale
+            changes, can be sampled once and scaled per frame through the
+            displacement argument. The y noise is sampled independently of
+            the x noise, at a z offset of half the noise period.
+            This differs from noise, which samples the y noise at the
+            x-displaced points: field*scale matches noise(scale=scale) in x
+            only
+
+        Keyword Arguments:
+            z (int, float): Variable parameter to ensure random generation of noise in each run
+        """
+
+        snoise = noise.SimplexNoise()
+
+        field = np.empty_like(self.pts)
+        field[..., 0] = snoise.noise3_array(self.pts[..., 0]/self.div,
+                                            self.pts[..., 1]/self.div,
+                                            z)
+        # Half the noise period away in z, so y is uncorrelated with x
+        field[..., 1] = snoise.noise3_array(self.pts[..., 0]/self.div,
+                                            self.pts[..., 1]/self.div,
+                                            z + snoise.period/2)
+        return field
+
+    def couple(self, line):
+        raise NotImplementedError("Line batches cannot be coupled")
+
+class LineBuffer:
+
+    def __init__(self, capacity=256, color=Color(rgb=(0, 0, 0)), alpha=1.0,
+                 line_width=2):
+        """
+        Minimal Line Buffer
+
+        Notes:
+            - Straight, undivided line segments written into preallocated
+            endpoint and color arrays. Meant for geometry that is rebuilt
+            every frame (e.g. wireframes): call reset at the start of a frame
+            and add segments without allocating any Line objects.
+            - Capacity doubles whenever a write would overflow the buffer
+
+        Keyword Arguments:
+            capacity (int): Number of segments preallocated
+            color (colour.Color): Default color of segments
+            alpha (float): Default alpha transparency of segments
+            line_width (float): Line Width
+        """
+
+        self.endpoints = np.empty((capacity, 2, 2))
+        self.rgba = np.empty((capacity, 4))
+        self.n = 0
+
+        self.color = color
+        self.alpha = alpha
+        self.line_width = line_width
+
+    def _reserve(self, n):
+        """ Grows buffers to fit n more segments """
+
+        capacity = len(self.endpoints)
+        if self.n + n > capacity:
+            capacity = max(2*capacity, self.n + n)
+            self.endpoints = np.resize(self.endpoints, (capacity, 2, 2))
+            self.rgba = np.resize(self.rgba, (capacity, 4))
+
+    def add(self, start, stop, color=None, alpha=None):
+        """
+        Add a single segment
+
+        Keyword Arguments:
+            start (tuple, float): Starting x, y coordinates for the segment
+            stop (tuple, float): Ending x, y coordinates for the segment
+            color (colour.Color, optional): Segment color. Default: buffer color
+            alpha (float, optional): Segment alpha. Default: buffer alpha
+        """
+
+        self.extend(((start, stop),), color, alpha)
+
+    def extend(self, endpoints, color=None, alpha=None):
+        """
+        Add many segments sharing a color
+
+        Keyword Arguments:
+            endpoints (Iterable): n x 2 x 2 container of start, stop x, y coordinates
+            color (colour.Color, optional): Segment color. Default: buffer color
+            alpha (float, optional): Segment alpha. Default: buffer alpha
+        """
+
+        endpoints = np.asarray(endpoints).reshape((-1, 2, 2))
+        color = self.color if color is None else color
+        alpha = self.alpha if alpha is None else alpha
+
+        self._reserve(len(endpoints))
+        i, j = self.n, self.n + len(endpoints)
+        self.endpoints[i:j] = endpoints
+        self.rgba[i:j] = (*color.get_rgb(), alpha)
+        self.n = j
+
+    def reset(self):
+        """ Empty the buffer, keeping its allocation """
+
+        self.n = 0
+
+    def _draw(self, canvas):
+        """ Line Buffer Drawing Method """
+
+        canvas.set_line_width(self.line_width)
+        for (start, stop), rgba in zip(self.endpoints[:self.n].tolist(),
+                                       self.rgba[:self.n].tolist()):
+            canvas.set_source_rgba(*rgba)
+            canvas.move_to(*start)
+            canvas.line_to(*stop)
+            canvas.stroke()
+
+def _segment_pts(segments, div):
+    """
+    Interpolates div // (n - 1) points along each of the n - 1 segments of an
+    (..., n, 2) array; leading axes are separate lines densified together
+    """
+
+    t = np.linspace(0, 1, div//(segments.shape[-2]-1), dtype=segments.dtype)
+    a, b = segments[..., :-1, :], segments[..., 1:, :]
+    pts = a[..., np.newaxis, :] + t[:, np.newaxis]*(b - a)[..., np.newaxis, :]
+    return pts.reshape((*segments.shape[:-2], -1, 2))
+
+def _noise_scale(scale):
+    """ Splits a noise scale into its x and y axis scalers """
+
+    if isinstance(scale, int) or isinstance(scale, float):
+        return scale, scale
+    elif isinstance(scale, tuple):
+        return scale[0], scale[1]
+    raise NotImplementedError("Noise scale only accepts int for uniform axis definition or tuple with length 2 for singular axis definition")
+
+def _simplex3(x, y, z, perm, grad3, period):
+    """ SimplexNoise.noise3 on plain arrays so it can be compiled by numba """
+
+    s = (x + y + z) * noise._F3
+    i = np.floor(x + s)
+    j = np.floor(y + s)
+    k = np.floor(z + s)
+    t = (i + j + k) * noise._G3
+    x0 = x - (i - t)
+    y0 = y - (j - t)
+    z0 = z - (k - t)
+
+    if x0 >= y0:
+        if y0 >= z0:
+            i1, j1, k1, i2, j2, k2 = 1, 0, 0, 1, 1, 0
+        elif x0 >= z0:
+            i1, j1, k1, i2, j2, k2 = 1, 0, 0, 1, 0, 1
+        else:
+            i1, j1, k1, i2, j2, k2 = 0, 0, 1, 1, 0, 1
+    else:
+        if y0 < z0:
+            i1, j1, k1, i2, j2, k2 = 0, 0, 1, 0, 1, 1
+        elif x0 < z0:
+            i1, j1, k1, i2, j2, k2 = 0, 1, 0, 0, 1, 1
+        else:
+            i1, j1, k1, i2, j2, k2 = 0, 1, 0, 1, 1, 0
+
+    ii = int(i) % period
+    jj = int(j) % period
+    kk = int(k) % period
+    corners = ((x0, y0, z0, perm[ii + perm[jj + perm[kk]]] % 12),
+               (x0 - i1 + noise._G3, y0 - j1 + noise._G3, z0 - k1 + noise._G3,
+                perm[ii + i1 + perm[jj + j1 + perm[kk + k1]]] % 12),
+               (x0 - i2 + 2.0 * noise._G3, y0 - j2 + 2.0 * noise._G3, z0 - k2 + 2.0 * noise._G3,
+                perm[ii + i2 + perm[jj + j2 + perm[kk + k2]]] % 12),
+               (x0 - 1.0 + 3.0 * noise._G3, y0 - 1.0 + 3.0 * noise._G3, z0 - 1.0 + 3.0 * noise._G3,
+                perm[ii + 1 + perm[jj + 1 + perm[kk + 1]]] % 12))
+
+    n = 0.0
+    for cx, cy, cz, gi in corners:
+        tt = 0.6 - cx**2 - cy**2 - cz**2
+        if tt > 0:
+            n += tt**4 * (grad3[gi, 0] * cx + grad3[gi, 1] * cy + grad3[gi, 2] * cz)
+    return n * 32.0
+
+def _noise_pts(pts, div, scalex, scaley, z, perm, grad3, period):
+    """ Line.noise displacement of every (x, y) row of pts, in place """
+
+    for n in prange(pts.shape[0]):
+        pts[n, 0] += scalex*_simplex3(pts[n, 0]/div[n], pts[n, 1]/div[n], z, perm, grad3, period)
+        pts[n, 1] += scaley*_simplex3(pts[n, 0]/div[n], pts[n, 1]/div[n], z, perm, grad3, period)
+
+if njit is not None:
+    _simplex3 = njit(cache=True)(_simplex3)
+    _noise_pts = njit(parallel=True, cache=True)(_noise_pts)
+
+def _add_noise(pts, div, scalex, scaley, z):
+    """
+    Adds Line.noise simplex displacement to an n x 2 array of points in place;
+    div is a scalar or one division count per point
+    """
+
+    snoise = noise.SimplexNoise()
+    # pts may be float32, but the noise itself is evaluated in float64: z is
+    # a microsecond count, and float32 would round z + x away at that size
+    div = np.broadcast_to(np.asarray(div, dtype=float), (len(pts),))
+
+    if njit is not None:
+        _noise_pts(pts, div, float(scalex), float(scaley), float(z),
+                   np.asarray(snoise.permutation, dtype=np.int64),
+                   np.asarray(noise._GRAD3, dtype=float), snoise.period)
+    else:
+        pts[:, 0] += scalex*snoise.noise3_array(pts[:, 0]/div, pts[:, 1]/div, z)
+        pts[:, 1] += scaley*snoise.noise3_array(pts[:, 0]/div, pts[:, 1]/div, z)
+
+def noise_lines(lines, scale=1, z=datetime.now().microsecond):
+    """
+    Applies Line.noise to many lines in one vectorized pass
+
+    Notes:
+        Points of every line are concatenated, displaced with the same simplex
+        noise Line.noise would apply (scaled by each line's own divisions), and
+        split back into each line's pts
+
+    Keyword Arguments:
+        lines (Iterable): objects.Line objects to add noise to
+        scale (int, float, tuple): See Line.noise
+        z (int, float): Variable parameter to ensure random generation of noise in each run
+    """
+
+    lines = list(lines)
+    if not lines:
+        return
+
+    scalex, scaley = _noise_scale(scale)
+    if scalex == 0 and scaley == 0:
+        return
+
+    counts = [len(line.pts) for line in lines]
+    pts = np.concatenate([line.pts for line in lines])
+    div = np.repeat([line.div for line in lines], counts)
+
+    _add_noise(pts, div, scalex, scaley, z)
+
+    for line, line_pts in zip(lines, np.split(pts, np.cumsum(counts)[:-1])):
+        line.pts = line_pts
+
+def _blend(dst, src, alpha):
+    """
+    Blends h x w x 4 src onto dst in place, weighted by the h x w x 1 alpha
+    of src scaled to [0, 1]
+    """
+
+    for y in prange(src.shape[0]):
+        for x in range(src.shape[1]):
+            a = alpha[y, x, 0]
+            for c in range(src.shape[2]):
+                dst[y, x, c] = a*src[y, x, c] + (1.0 - a)*dst[y, x, c]
+
+def _blend_cv2(dst, src, alpha):
+    """
+    Same as _blend through OpenCV's SIMD blendLinear, which rounds where
+    _blend truncates (results differ by at most one level)
+    """
+
+    weights = np.ascontiguousarray(alpha[:, :, 0], dtype=np.float32)
+    dst[:] = cv2.blendLinear(np.ascontiguousarray(src), np.ascontiguousarray(dst),
+                             weights, 1 - weights)
+
+if njit is not None:
+    _blend = njit(parallel=True, cache=True)(_blend)
+else:
+    _blend = _blend_cv2
+
 class Image:
     
     def __init__(self, data, position=(0, 0), channels=4):
@@ -267,6 +728,23 @@ class Image:
             self.image = cv2.cvtColor(self.image, cv2.COLOR_RGB2RGBA)
         
         self.position = position
+
+    @property
+    def image(self):
+        """ Image pixel data """
+        return self._image
+
+    @image.setter
+    def image(self, image):
+        self._image = image
+        self._alpha = None
+
+    @property
+    def alpha(self):
+        """ Alpha channel scaled to [0, 1], cached until image is replaced """
+        if self._alpha is None:
+            self._alpha = self._image[:, :, 3:4] / 255.0
+        return self._alpha
         
     def _draw(self, canvas):
         """ Image Drawing Method """
@@ -281,14 +759,9 @@ class Image:
     
         if not (cy1 >= cy2 or cx1 >= cx2 or iy1 >= iy2 or ix1 >= ix2):
         
-            image = self.image[iy1:iy2, ix1:ix2]
-            alpha_mask = self.image[:, :, 3] / 255.0
-            image_alpha = alpha_mask[iy1:iy2, ix1:ix2, np.newaxis]
-
-            canvas_crop = canvas[cy1:cy2, cx1:cx2]
-            canvas_alpha = 1.0 - image_alpha
-        
-            canvas_crop[:] = image_alpha * image + canvas_alpha * canvas_crop
+            # Only the visible crop is blended, compiled when numba is available
+            _blend(canvas[cy1:cy2, cx1:cx2], self.image[iy1:iy2, ix1:ix2],
+                   self.alpha[iy1:iy2, ix1:ix2])
             
     def mirror(self, axis):
         """ Mirror Image. Follows np.flip axis argument """
@@ -314,6 +787,34 @@ class Image:
         center = tuple(np.array(self.image.shape[1::-1]) / 2)
         rotation = cv2.getRotationMatrix2D(center, angle, 1.0)
         self.image = cv2.warpAffine(self.image, rotation, self.image.shape[1::-1], flags=cv2.INTER_LINEAR)
+
+    def transform(self, size=None, angle=0, interpolation=cv2.INTER_LINEAR):
+        """
+        Resize and rotate Image in a single resample
+
+        Notes:
+            Same as resize followed by rotate, but both are composed into one
+            affine matrix for a single cv2.warpAffine, instead of resampling
+            the image twice. Pixels outside the source image are transparent,
+            as with rotate
+
+        Keyword Arguments:
+            size (Iterable: int, optional): Resize shape. Default: current shape
+            angle (float): Rotation angle in degrees
+            interpolation (cv2 method): cv2 Interpolation method
+        """
+
+        height, width = self.image.shape[:2]
+        size = (width, height) if size is None else tuple(size)
+        sx, sy = size[0] / width, size[1] / height
+
+        # Scaling maps pixel centers as cv2.resize does, then rotates about
+        # the center of the resized image as rotate does
+        scale = np.array([[sx, 0, 0.5*(sx - 1)],
+                          [0, sy, 0.5*(sy - 1)],
+                          [0, 0, 1]])
+        rotation = cv2.getRotationMatrix2D((size[0] / 2, size[1] / 2), angle, 1.0)
+        self.image = cv2.warpAffine(self.image, rotation @ scale, size, flags=interpolation)
     
 class Video:
     
@@ -325,16 +826,86 @@ class Video:
         self.video = imageio.get_reader(path)
         self.position = position
         self.frame = 0
+        # Read once, readers are not safe to query while the prefetching
+        # thread decodes from them
+        self._length = len(self.video)
         
         self._mirror_axis = None
-        
+        # (frame, decoded frame or error) queue filled ahead of drawing by a
+        # background thread, with the event stopping it, see _start_prefetch
+        self._frames = None
+        self._stop = None
+        self._thread = None
+
+    def _put(self, frames, stop, item):
+        """ Puts item in frames, giving up once stop is set """
+
+        while not stop.is_set():
+            try:
+                frames.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _prefetch(self, frame, frames, stop):
+        """
+        Decodes frames in playback order from frame into frames until stop is
+        set. A decoding error is queued in place of its frame and ends the thread
+        """
+
+        while not stop.is_set():
+            try:
+                data = self.video.get_data(frame)
+            except Exception as error:
+                self._put(frames, stop, (frame, error))
+                return
+            self._put(frames, stop, (frame, data))
+            frame = 0 if frame == self._length-1 else frame + 1
+
+    def _start_prefetch(self):
+        """ Starts decoding frames ahead from self.frame """
+
+        self._frames = queue.Queue(maxsize=4)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._prefetch,
+                                        args=(self.frame, self._frames, self._stop),
+                                        daemon=True)
+        self._thread.start()
+
+    def _stop_prefetch(self):
+        """ Stops the prefetching thread, if running, and drops queued frames """
+
+        if self._frames is not None:
+            self._stop.set()
+            self._thread.join()
+            self._frames = self._stop = self._thread = None
+
+    def close(self):
+        """ Stops decoding frames ahead and closes the video reader """
+
+        self._stop_prefetch()
+        self.video.close()
+
     def _draw(self, data):
-        
-        img = Image(self.video.get_data(self.frame), self.position)
+
+        if self._frames is None:
+            self._start_prefetch()
+
+        frame, decoded = self._frames.get()
+        if frame != self.frame:
+            # self.frame was set since the frames were queued, seek to it
+            self._stop_prefetch()
+            self._start_prefetch()
+            frame, decoded = self._frames.get()
+        if isinstance(decoded, Exception):
+            self._stop_prefetch()
+            raise decoded
+
+        img = Image(decoded, self.position)
         if isinstance(self._mirror_axis, int):
             img.mirror(self._mirror_axis)
         img._draw(data)
-        if self.frame == len(self.video)-1:
+        if self.frame == self._length-1:
             self.frame = 0
         else:
             self.frame += 1
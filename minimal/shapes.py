@@ -5,8 +5,6 @@ Minimal wrapper of Pycairo shapes
 from __future__ import annotations
 
 from copy import deepcopy
-from functools import partial
-from itertools import cycle, chain
 from typing import Dict, List, Optional, Type, Union
 
 import cairo
@@ -16,6 +14,17 @@ import numpy as np
 
 from . import display
 
+def _state_index(at_end: str, step: int, n: int) -> int:
+    """ Index into n transform states after step steps, see transform at_end """
+
+    if at_end == "restart":
+        return step % n
+    if at_end == "reverse":
+        # States run forward then back to the first state, then restart
+        step %= 2*n - 1
+        return step if step < n else 2*n - 2 - step
+    return min(step, n - 1)
+
 class CairoMinimalObject:
 
     """
@@ -68,6 +77,10 @@ class CairoMinimalObject:
                                 'scalex', 'scaley']
     #TODO: Scale X, Scale Y Transforms not working
 
+    # Whether transforming y adds the last translate shift (as x always
+    # does) and shifts the shape points, see transform
+    _SHIFTS_Y = False
+
     def __init__(self,
                  fill_color: Optional[Type[Color]] = Color(rgb=(0, 0, 0)),
                  fill_alpha: Optional[float] = 1.0,
@@ -89,6 +102,51 @@ class CairoMinimalObject:
 
         self.pattern = None
         self.preserve_pattern = None
+        # (at_end, states, starting frame) of transformed variables by name,
+        # the number of transform steps taken and the last translate shift,
+        # see transform
+        self._transforms = {}
+        self._frame = 0
+        self._dx, self._dy = 0, 0
+        # ((scalex, scaley, rotate_angle), cairo.Matrix) and whether 'up'
+        # saved the canvas state, see transform_axis
+        self._axis_matrix = None
+        self._axis_saved = False
+        # (gradient center, first color stop) the pattern was built with and
+        # the (x, y) shift moving it onto the shape, reset with the pattern,
+        # see _preserve_pattern
+        self._pattern_origin = None
+        self._pattern_shift = None
+
+    @property
+    def fill_color(self) -> Optional[Type[Color]]:
+        """ Shape Fill Color, with its rgb triple cached on assignment """
+        return self._fill[0]
+
+    @fill_color.setter
+    def fill_color(self, color: Optional[Type[Color]]) -> None:
+        self._fill = (color, color.get_rgb() if color else None)
+
+    @property
+    def outline_color(self) -> Optional[Type[Color]]:
+        """ Shape Outline Color, with its rgb triple cached on assignment """
+        return self._outline[0]
+
+    @outline_color.setter
+    def outline_color(self, color: Optional[Type[Color]]) -> None:
+        self._outline = (color, color.get_rgb() if color else None)
+
+    @property
+    def pattern(self) -> Optional[Type[cairo.Pattern]]:
+        """ Cairo Pattern object, whether it is a Gradient is cached on assignment """
+        return self._pattern
+
+    @pattern.setter
+    def pattern(self, pattern: Optional[Type[cairo.Pattern]]) -> None:
+        self._pattern = pattern
+        self._pattern_is_gradient = isinstance(pattern, Gradient)
+        self._pattern_origin = None
+        self._pattern_shift = None
 
     def linear_gradient(self,
                         color: Type[Color],
@@ -118,7 +176,7 @@ class CairoMinimalObject:
         if not self.pattern:
             self.pattern = LinearGradient(*xy1, *xy2)
             self.pattern.add_color_stop_rgba(0,
-                                             *self.fill_color.get_rgb(),
+                                             *self._fill[1],
                                              self.fill_alpha)
             self.pattern.add_color_stop_rgba(offset,
                                              *color.get_rgb(),
@@ -154,7 +212,7 @@ class CairoMinimalObject:
         if not self.pattern:
             self.pattern = RadialGradient(*cr1, *cr2)
             self.pattern.add_color_stop_rgba(0,
-                                             *self.fill_color.get_rgb(),
+                                             *self._fill[1],
                                              self.fill_alpha)
             self.pattern.add_color_stop_rgba(offset,
                                              *color.get_rgb(),
@@ -175,40 +233,50 @@ class CairoMinimalObject:
 
         if self.fill_color: # self.fill_color can be None for outlined objects
             if self.pattern:
+                if self._pattern_shift:
+                    dx, dy = self._pattern_shift
+                    self.pattern.set_matrix(cairo.Matrix(x0=-dx, y0=-dy))
                 canvas.set_source(self.pattern)
             else:
-                canvas.set_source_rgba(*self.fill_color.get_rgb(),
-                                       self.fill_alpha)
+                canvas.set_source_rgba(*self._fill[1], self.fill_alpha)
 
-        if not isinstance(self, Text):
+        if isinstance(self, Text):
+            canvas.stroke()
+        elif self.outline_width > 0 and self.outline_alpha > 0:
             if self.fill_color:
                 canvas.fill_preserve()
-            canvas.set_source_rgba(*self.outline_color.get_rgb(),
-                                   self.outline_alpha)
+            canvas.set_source_rgba(*self._outline[1], self.outline_alpha)
             canvas.set_line_width(self.outline_width)
-
-        canvas.stroke()
+            canvas.stroke()
+        elif self.fill_color:
+            # Fill only, an invisible outline is not stroked
+            canvas.fill()
+        else:
+            canvas.new_path()
 
         self.transform()
-        if self.preserve_pattern and issubclass(type(self.pattern), Gradient):
+        if self.preserve_pattern and self._pattern_is_gradient:
             self._preserve_pattern()
 
     def copy(self) -> CairoMinimalObject:
         """
-        Return a deepcopy of Shape Object
+        Return a copy of Shape Object
 
         Notes:
-            Gradient Objects not pickleable so we will just temporarily store
-            it and reassign
+            Attributes are copied shallowly except for the mutable ones:
+            arrays, lists and dicts (e.g. Polygon points, metadata and
+            transforms) are copied so the copy moves independently.
+            Colors and the gradient pattern are shared with the original
+            (gradient objects are not pickleable)
         """
 
-        pattern = self.pattern
-        self.pattern = None
-
-        copy = deepcopy(self)
-
-        copy.pattern = pattern
-        self.pattern = pattern
+        copy = type(self).__new__(type(self))
+        for name, value in self.__dict__.items():
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+            elif isinstance(value, (list, dict)):
+                value = deepcopy(value)
+            copy.__dict__[name] = value
 
         return copy
 
@@ -236,40 +304,71 @@ class CairoMinimalObject:
 
         self.x += dx
         self.y += dy
+        self._shift_points(dx, dy)
 
-        if isinstance(self, Polygon):
-            self.lpts += np.array([dx, dy, dx, dy, dx, dy])
-
-        if self.preserve_pattern:
+        if self.preserve_pattern and self._pattern_is_gradient:
             self._preserve_pattern()
 
+    def _shift_points(self, dx: float, dy: float) -> None:
+        """
+        Shifts points stored by the shape besides x, y. Overridden by shapes
+        that store them (e.g. Polygon)
+        """
+
     def _preserve_pattern(self) -> None:
         """
         Preserves pattern by after calling a method that changes the position
         of the shape
+
+        Notes:
+            The gradient is kept and moved onto the shape position by a
+            translation matrix, applied when the pattern is set as source,
+            instead of being rebuilt stop by stop. It is only rebuilt when
+            the fill color, its first color stop, has changed
+        """
+
+        fill = (*self._fill[1], self.fill_alpha)
+        origin = self._pattern_origin
+        if origin is None:
+            # A new pattern, checked against its own first color stop
+            if tuple(self.pattern.get_color_stops_rgba()[0][1:]) != fill:
+                self._rebuild_pattern()
+        elif origin[2] != fill:
+            # Rebuilding replaces the pattern, which resets its origin
+            self._rebuild_pattern()
+        origin = self._pattern_origin
+        if origin is None:
+            if isinstance(self.pattern, RadialGradient):
+                cx, cy = self.pattern.get_radial_circles()[:2]
+            else:
+                x1, y1, x2, y2 = self.pattern.get_linear_points()
+                cx, cy = (x1 + x2)/2, (y1 + y2)/2
+            origin = self._pattern_origin = (cx, cy, fill)
+
+        self._pattern_shift = (self.x - origin[0], self.y - origin[1])
+
+    def _rebuild_pattern(self) -> None:
+        """
+        Rebuilds the gradient centered on the shape, with the current fill
+        color as its first color stop
         """
 
         if isinstance(self.pattern, RadialGradient):
             cx1, cy1, r1, cx2, cy2, r2 = self.pattern.get_radial_circles()
             dx, dy = cx2-cx1, cy2-cy1
-            fn = partial(self.radial_gradient,
-                         cr1=(self.x, self.y, r1),
-                         cr2=(self.x+dx, self.y+dy, r2))
+            pattern = RadialGradient(self.x, self.y, r1,
+                                     self.x+dx, self.y+dy, r2)
         elif isinstance(self.pattern, LinearGradient):
             x1, y1, x2, y2 = self.pattern.get_linear_points()
             dx, dy = x2-x1, y2-y1
-            fn = partial(self.linear_gradient,
-                         xy1=(self.x-dx/2, self.y-dy/2),
-                         xy2=(self.x+dx/2, self.y+dy/2))
-
-        color_stops = self.pattern.get_color_stops_rgba()
-        self.pattern = None
+            pattern = LinearGradient(self.x-dx/2, self.y-dy/2,
+                                     self.x+dx/2, self.y+dy/2)
 
-        for color_stop in color_stops[1:]:
-            fn(color=Color(rgb=color_stop[1:4]),
-               alpha=color_stop[-1],
-               offset = color_stop[0]
-               )
+        pattern.add_color_stop_rgba(0, *self._fill[1], self.fill_alpha)
+        # Remaining (offset, r, g, b, a) stops are added back as they are
+        for color_stop in self.pattern.get_color_stops_rgba()[1:]:
+            pattern.add_color_stop_rgba(*color_stop)
+        self.pattern = pattern
 
     def transform(self, at_end: str = "restart", **kwargs) -> None:
         """
@@ -295,40 +394,43 @@ class CairoMinimalObject:
         if kwargs:
             for kwarg, t in kwargs.items():
                 if kwarg in self._TRANSFORMABLE_VARIABLES:
-                    if at_end == "restart":
-                        _iter = cycle(t)
-                    elif at_end == "reverse":
-                        _iter = cycle(t + t[::-1][1:])
-                    elif at_end == "stop":
-                        _iter = chain(t, cycle([t[-1]]))
-                    else:
+                    if at_end not in ("restart", "reverse", "stop"):
                         raise KeyError("at_end specification not recognized",
                                        "select a supported method")
 
-                    setattr(self, f"_{kwarg}", _iter)
+                    # Numeric states are held as an array, others (e.g.
+                    # colors, text) as a list
+                    states = np.asarray(t)
+                    if states.dtype.kind not in "iuf":
+                        states = list(t)
+                    self._transforms[kwarg] = (at_end, states, self._frame)
 
                 else:
                     raise AttributeError("Variable provided is not transformable: ",
                                          f"{kwarg}")
 
+            # Kept in _TRANSFORMABLE_VARIABLES order, the order they are applied in
+            order = self._TRANSFORMABLE_VARIABLES
+            self._transforms = dict(sorted(self._transforms.items(),
+                                           key=lambda item: order.index(item[0])))
+
         else:
-            for transformable_variable in self._TRANSFORMABLE_VARIABLES:
-                if hasattr(self, f"_{transformable_variable}"):
-                    prev = getattr(self, transformable_variable)
-                    if transformable_variable == "x":
-                        _dx = self._dx if hasattr(self, "_dx") else 0
-                        setattr(self, transformable_variable, next(getattr(self, "_x"))+_dx)
-                        if isinstance(self, Polygon):
-                            dx = self.x - prev + _dx
-                            self.lpts += np.array([dx, 0, dx, 0, dx, 0])
-                    elif transformable_variable == "y" and isinstance(self, Polygon):
-                        _dy = self._dy if hasattr(self, "_dy") else 0
-                        setattr(self, transformable_variable, next(getattr(self, "_y"))+_dy)
-                        if isinstance(self, Polygon):
-                            dy = self.y - prev + _dy
-                            self.lpts += np.array([0, dy, 0, dy, 0, dy])
-                    else:
-                        setattr(self, transformable_variable, next(getattr(self, f"_{transformable_variable}")))
+            frame = self._frame
+            self._frame += 1
+            for variable, (at_end, states, start) in self._transforms.items():
+                i = _state_index(at_end, frame - start, len(states))
+                # item returns array states as plain Python numbers
+                value = states[i] if isinstance(states, list) else states.item(i)
+                if variable == "x":
+                    prev = self.x
+                    self.x = value + self._dx
+                    self._shift_points(self.x - prev + self._dx, 0)
+                elif variable == "y" and self._SHIFTS_Y:
+                    prev = self.y
+                    self.y = value + self._dy
+                    self._shift_points(0, self.y - prev + self._dy)
+                else:
+                    setattr(self, variable, value)
 
     def transform_axis(self,
                        canvas: Union[Type[display.Canvas], Type[display.Frame]],
@@ -338,25 +440,32 @@ class CairoMinimalObject:
 
         Notes:
             Two potential scaling options - 'up' and 'down'
-            'up' scale: Apply scale as-is
-            'down' scale Return scale to base 1.0, 1.0
+            'up' scale: Saves the canvas state and applies scale as-is
+            'down' scale Restores the canvas state saved by 'up', so the
+            scale is undone exactly even if it was transformed in between
+            The identity scale (no scale or rotation) is skipped by both
 
         Keyword Arguments:
             canvas (display.Canvas, display.Frame): Minimal Display object
             method (str): Scaler method
         """
         if method == 'up':
-            canvas.scale(self.scalex, self.scaley)
-            if self.rotate_angle:
-                #TODO: rotate_angle works, but doesnt rotate around center/point
-                # canvas.translate(self.x, self.y)
-                canvas.rotate(self.rotate_angle)
-
-        if method == 'down':
-            canvas.scale(1.0/self.scalex, 1.0/self.scaley)
-            if self.rotate_angle:
-                canvas.rotate(-self.rotate_angle)
-                # canvas.translate(-self.x, -self.y)
+            #TODO: rotate_angle works, but doesnt rotate around center/point
+            key = (self.scalex, self.scaley, self.rotate_angle)
+            # The identity scale leaves the canvas as is, nothing to undo
+            self._axis_saved = key != (1.0, 1.0, 0.0)
+            if self._axis_saved:
+                if self._axis_matrix is None or self._axis_matrix[0] != key:
+                    matrix = cairo.Matrix()
+                    matrix.scale(self.scalex, self.scaley)
+                    matrix.rotate(self.rotate_angle)
+                    self._axis_matrix = (key, matrix)
+                canvas.save()
+                canvas.transform(self._axis_matrix[1])
+
+        if method == 'down' and self._axis_saved:
+            canvas.restore()
+            self._axis_saved = False
 
 
 class Circle(CairoMinimalObject):
@@ -432,14 +541,87 @@ class Rectangle(CairoMinimalObject):
         super()._draw(canvas)
         self.transform_axis(canvas, 'down')
 
+class CircleBatch(CairoMinimalObject):
+
+    def __init__(self, circles, x=0.0, y=0.0, **kwargs):
+        """
+        Minimal Circle Batch
+
+        Notes:
+            Draws many circles sharing one style as a single path, filled and
+            outlined once, instead of one Circle object per circle
+            X, Y offset every circle, so translating or transforming them
+            moves the whole batch
+
+        Keyword Arguments:
+            circles (list: float, ndarray): n x 3 center X, Y coordinates and
+                radius of each circle
+            x (float): Optional: X-offset of every circle. Default: 0
+            y (float): Optional: Y-offset of every circle. Default: 0
+            **kwargs: CairoMinimalObject Keyword Arguments
+        """
+
+        super().__init__(**kwargs)
+
+        self.x, self.y = x, y
+        self.circles = np.asarray(circles, dtype=float).reshape((-1, 3))
+
+    def _draw(self, canvas):
+        """ Circle Batch Object Drawing Method """
+
+        self.transform_axis(canvas, 'up')
+        new_sub_path, arc = canvas.new_sub_path, canvas.arc
+        for x, y, radius in (self.circles + (self.x, self.y, 0)).tolist():
+            # Without a new sub path each arc is joined to the previous one
+            new_sub_path()
+            arc(x, y, radius, 0.0, 2*np.pi)
+        super()._draw(canvas)
+        self.transform_axis(canvas, 'down')
+
+class RectangleBatch(CairoMinimalObject):
+
+    def __init__(self, rects, x=0.0, y=0.0, **kwargs):
+        """
+        Minimal Rectangle Batch
+
+        Notes:
+            Draws many rectangles sharing one style as a single path, filled
+            and outlined once, instead of one Rectangle object per rectangle
+            X, Y offset every rectangle, so translating or transforming them
+            moves the whole batch
+
+        Keyword Arguments:
+            rects (list: float, ndarray): n x 4 upper left corner X, Y
+                coordinates, width and height of each rectangle
+            x (float): Optional: X-offset of every rectangle. Default: 0
+            y (float): Optional: Y-offset of every rectangle. Default: 0
+            **kwargs: CairoMinimalObject Keyword Arguments
+        """
+
+        super().__init__(**kwargs)
+
+        self.x, self.y = x, y
+        self.rects = np.asarray(rects, dtype=float).reshape((-1, 4))
+
+    def _draw(self, canvas):
+        """ Rectangle Batch Object Drawing Method """
+
+        self.transform_axis(canvas, 'up')
+        rectangle = canvas.rectangle
+        for x, y, width, height in (self.rects + (self.x, self.y, 0, 0)).tolist():
+            rectangle(x, y, width, height)
+        super()._draw(canvas)
+        self.transform_axis(canvas, 'down')
+
 class Triangle(CairoMinimalObject):
 
     def __init__(self, vertices, **kwargs):
         """ DOCSTRING """
 
-        assert len(vertices) == 3, "Only three vertices allowed in triangle class"
+        if len(vertices) != 3:
+            raise ValueError("Only three vertices allowed in triangle class")
 
-        self.vertices = np.array(vertices)
+        self.vertices = np.array(vertices, dtype=float)
 
         super().__init__(**kwargs)
 
@@ -447,10 +629,11 @@ class Triangle(CairoMinimalObject):
         """ DOCSTRING """
 
         self.transform_axis(canvas, "up")
-        canvas.move_to(*self.vertices[0])
-        for vertex in self.vertices[1:]:
-            canvas.line_to(*vertex)
-        canvas.line_to(*self.vertices[0])
+        (x0, y0), (x1, y1), (x2, y2) = self.vertices.tolist()
+        canvas.move_to(x0, y0)
+        canvas.line_to(x1, y1)
+        canvas.line_to(x2, y2)
+        canvas.line_to(x0, y0)
         canvas.close_path()
         super()._draw(canvas)
         self.transform_axis(canvas, 'down')
@@ -458,6 +641,8 @@ class Triangle(CairoMinimalObject):
 
 class Polygon(CairoMinimalObject):
 
+    _SHIFTS_Y = True
+
     def __init__(self, x, y, **kwargs):
         """
         Minimal Polygon
@@ -475,6 +660,32 @@ class Polygon(CairoMinimalObject):
         self.ltypes = []
         self.lpts = np.empty((0, 6)) #Default: cx1, cy1, cx2, cy2, x, y. If line_to, cxy1, cxy2 do not matter
 
+    @property
+    def lpts(self) -> np.ndarray:
+        """
+        n x 6 array of segment points (cx1, cy1, cx2, cy2, x, y). Segments
+        added by line_to and curve_to are kept as rows and joined into the
+        array once, on first access after adding
+        """
+        if self._lpts_rows:
+            self._lpts = np.concatenate((self._lpts, np.asarray(self._lpts_rows, dtype=float)))
+            self._lpts_rows = []
+        return self._lpts
+
+    @lpts.setter
+    def lpts(self, lpts: np.ndarray) -> None:
+        self._lpts = lpts
+        self._lpts_rows = []
+
+    def _shift_points(self, dx, dy):
+        """ Shifts x and y of every segment point (cx1, cy1, cx2, cy2, x, y) in place """
+
+        lpts = self.lpts
+        if dx:
+            lpts[:, 0::2] += dx
+        if dy:
+            lpts[:, 1::2] += dy
+
     def line_to(self, x=None, y=None, segments=None):
         """
         Create line from previous vertex to current defined vertex
@@ -485,16 +696,19 @@ class Polygon(CairoMinimalObject):
         Keyword Arguments:
             x (float): X-coordinate for next polygon vertex
             y (float): Y-coordinate for next polygon vertex
-            segments (list: float): X,Y coordinates for next n-polygon vertices
+            segments (list: float, ndarray): n x 2 X,Y coordinates for next
+                n-polygon vertices
         """
 
-        if x and y:
+        if x is not None and y is not None:
             self.ltypes.append('line_to')
-            self.lpts = np.append(self.lpts, np.array([[0, 0, 0, 0, x, y]]), axis=0)
-        elif segments:
-            for segment in segments:
-                self.ltypes.append('line_to')
-                self.lpts = np.append(self.lpts, np.array([[0, 0, 0, 0, *segments]]), axis=0)
+            self._lpts_rows.append((0, 0, 0, 0, x, y))
+        elif segments is not None and len(segments):
+            segments = np.asarray(segments, dtype=float).reshape((-1, 2))
+            rows = np.zeros((len(segments), 6))
+            rows[:, 4:] = segments
+            self.ltypes.extend(['line_to']*len(rows))
+            self.lpts = np.concatenate((self.lpts, rows))
         else:
             raise ValueError("Missing value for either x and y or segments of x and y")
 
@@ -510,18 +724,19 @@ class Polygon(CairoMinimalObject):
             y (float): Y-coordinate for next polygon vertex
             cxy1 (list: float): Control point 1 X + Y Coordinates
             cxy2 (list: float): Control point 2 X + Y Coordinates
-            segments (list: float): X,Y coordinates + curve control points for next n-polygon vertices
+            segments (list: float, ndarray): n x 6 curve control points + X,Y
+                coordinates (cx1, cy1, cx2, cy2, x, y) for next n-polygon vertices
         """
 
-        if cxy1 and cxy2 and x and y:
+        if cxy1 is not None and cxy2 is not None and x is not None and y is not None:
             cx1, cy1 = cxy1
             cx2, cy2 = cxy2
             self.ltypes.append('curve_to')
-            self.lpts = np.append(self.lpts, np.array([[cx1, cy1, cx2, cy2, x, y]]), axis=0)
-        elif segments:
-            for segment in segments:
-                self.ltypes.append('curve_to')
-                self.lpts = np.append(self.lpts, np.array([[*cxy1, *cxy2, x, y]]), axis=0)
+            self._lpts_rows.append((cx1, cy1, cx2, cy2, x, y))
+        elif segments is not None and len(segments):
+            rows = np.asarray(segments, dtype=float).reshape((-1, 6))
+            self.ltypes.extend(['curve_to']*len(rows))
+            self.lpts = np.concatenate((self.lpts, rows))
         else:
             raise ValueError("Missing value for either curve parameters or segments of curve parameters")
 
@@ -530,11 +745,13 @@ class Polygon(CairoMinimalObject):
 
         self.transform_axis(canvas, 'up')
         canvas.move_to(self.x, self.y)
-        for ltype, lpt in zip(self.ltypes, self.lpts):
+        # Rows as plain floats and cairo methods looked up once per draw
+        line_to, curve_to = canvas.line_to, canvas.curve_to
+        for ltype, lpt in zip(self.ltypes, self.lpts.tolist()):
             if ltype == 'line_to':
-                canvas.line_to(*lpt[-2:])
+                line_to(lpt[4], lpt[5])
             elif ltype == 'curve_to':
-                canvas.curve_to(*lpt)
+                curve_to(*lpt)
 
         canvas.close_path()
         super()._draw(canvas)
@@ -580,12 +797,22 @@ class Text(CairoMinimalObject):
         self.font = font if font else cairo.ToyFontFace("").get_family()
         self.font_slant = getattr(cairo.FontSlant, font_slant)
         self.font_weight = getattr(cairo.FontWeight, font_weight)
+        # ((font, font_slant, font_weight), cairo.ToyFontFace), see _font_face
+        self._face = None
+
+    def _font_face(self):
+        """ Toy font face of the current font, rebuilt only when it changes """
+
+        key = (self.font, self.font_slant, self.font_weight)
+        if self._face is None or self._face[0] != key:
+            self._face = (key, cairo.ToyFontFace(*key))
+        return self._face[1]
 
     def _draw(self, canvas):
         """ Text Object Drawing Method """
 
         super()._draw(canvas)
-        canvas.select_font_face(self.font, self.font_slant, self.font_weight)
+        canvas.set_font_face(self._font_face())
         canvas.set_font_size(self.font_size)
 
         canvas.move_to(self.x, self.y)